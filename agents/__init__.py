@@ -1,6 +1,10 @@
 # Agents package
 
-from .base_agent import AnalyzerAgent, AgentConfig
+from .base_agent import AnalyzerAgent, AgentConfig, PROMPT_VERSION
+from .rate_limiter import RateLimiter
+from .response_cache import (
+    ResponseCache, SingleFlight, default_response_cache, default_findings_cache, default_single_flight
+)
 from .logic_analyzer import LogicAnalyzerAgent
 from .readability_analyzer import ReadabilityAnalyzerAgent
 from .performance_analyzer import PerformanceAnalyzerAgent
@@ -9,6 +13,13 @@ from .security_analyzer import SecurityAnalyzerAgent
 __all__ = [
     "AnalyzerAgent",
     "AgentConfig",
+    "PROMPT_VERSION",
+    "RateLimiter",
+    "ResponseCache",
+    "SingleFlight",
+    "default_response_cache",
+    "default_findings_cache",
+    "default_single_flight",
     "LogicAnalyzerAgent",
     "ReadabilityAnalyzerAgent",
     "PerformanceAnalyzerAgent",
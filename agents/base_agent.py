@@ -1,36 +1,301 @@
 """
 Abstract base class for analyzer agents
 """
+import asyncio
+import hashlib
+import io
 import json
 import logging
+import random
+import re
+import weakref
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib
+    orjson = None
+
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.language_models import BaseLanguageModel
 
-from models import Finding, ReviewContext, SeverityLevel, AnalysisCategory
+from agents.rate_limiter import RateLimiter
+from agents.response_cache import (
+    ResponseCache, default_response_cache, default_findings_cache, default_single_flight
+)
+from models import Finding, FileChange, ReviewContext, SeverityLevel, AnalysisCategory
 
 logger = logging.getLogger(__name__)
 
+# Part of every response and findings cache key. Bump it when prompt
+# construction, agent pre-analysis or response parsing changes, since cached
+# results from the old code would otherwise be served for up to their TTL
+PROMPT_VERSION = 1
+
+# First fenced code block if there is one, otherwise everything from the first
+# JSON array/object onwards. Anchored so the fence alternative always wins.
+_JSON_CONTENT_RE = re.compile(
+    r"\A(?:.*?```[\w-]*\s*(?P<fenced>.*?)```|[^\[{]*(?P<bare>[\[{].*))",
+    re.DOTALL
+)
+
+# Comment markers by language; "#" only starts a comment where the language
+# says so (JS private fields, Rust attributes and C preprocessor lines are code)
+_HASH_COMMENT = r"\#"
+_C_COMMENT = r"//|/\*(?!.*\*/\s*\S)"
+_DASH_COMMENT = r"--(?=\s|$)"
+_MARKUP_COMMENT = r"<!--"
+
+# Unknown languages accept every marker, but "#" lines that look like
+# preprocessor directives or attributes are still treated as code
+_DEFAULT_COMMENT_MARKERS = "|".join((
+    r"\#(?!\s*(?:include|define|undef|if|ifdef|ifndef|elif|else|endif|pragma)\b|!?\[)",
+    _C_COMMENT,
+    _DASH_COMMENT,
+    _MARKUP_COMMENT,
+))
+
+
+def _compile_trivial_line_re(comment_markers: str) -> re.Pattern:
+    """
+    Build the pattern for changed lines that can't introduce a finding on their own
+    
+    Blank lines, comments, imports and version bumps match; anything else
+    sends the diff to the LLM.
+    
+    Args:
+        comment_markers: Regex alternatives that start a line comment
+        
+    Returns:
+        Compiled pattern, used with fullmatch
+    """
+    return re.compile(
+        r"""\s*(?:
+            (?:""" + comment_markers + r""").*
+          | (?:import|from\s+\S+\s+import|using|package)\s[^;=()]*;?
+          | (?:__version__|version|VERSION|"version")\s*[:=]\s*["'][\w.+-]*["']\s*,?
+        )?\s*""",
+        re.VERBOSE
+    )
+
+
+_HASH_TRIVIAL_LINE_RE = _compile_trivial_line_re(_HASH_COMMENT)
+_C_TRIVIAL_LINE_RE = _compile_trivial_line_re(_C_COMMENT)
+_DASH_TRIVIAL_LINE_RE = _compile_trivial_line_re(_DASH_COMMENT)
+_MARKUP_TRIVIAL_LINE_RE = _compile_trivial_line_re(_MARKUP_COMMENT)
+_DEFAULT_TRIVIAL_LINE_RE = _compile_trivial_line_re(_DEFAULT_COMMENT_MARKERS)
+
+_TRIVIAL_LINE_RES = {
+    **dict.fromkeys(
+        ("python", "shell", "yaml", "ruby", "toml", "ini", "config", "r", "dockerfile", "makefile"),
+        _HASH_TRIVIAL_LINE_RE
+    ),
+    **dict.fromkeys(
+        ("c", "cpp", "csharp", "java", "javascript", "typescript", "go", "rust",
+         "php", "swift", "kotlin", "scala", "dart", "css", "scss", "sass", "less"),
+        _C_TRIVIAL_LINE_RE
+    ),
+    **dict.fromkeys(("sql", "haskell", "elm"), _DASH_TRIVIAL_LINE_RE),
+    **dict.fromkeys(("html", "xml", "markdown"), _MARKUP_TRIVIAL_LINE_RE),
+}
+
+# Retry delays in seconds
+_BASE_RETRY_BACKOFF = 0.2
+_MAX_RETRY_BACKOFF = 30.0
+_MAX_RETRY_AFTER = 60.0
+
+# Markup, data and config formats; the LLM still reviews their diffs, but
+# code heuristics (loops, queries, nesting, naming) don't apply to them
+NON_CODE_LANGUAGES = frozenset({
+    "json", "yaml", "toml", "xml", "ini", "config",
+    "markdown", "restructuredtext", "text",
+    "html", "css", "scss", "sass", "less",
+})
+
+_SEVERITY_BY_VALUE = {severity.value: severity for severity in SeverityLevel}
+
+# Fixed sections of the human prompt
+_CHANGES_HEADER = "Code Changes to Analyze:\n" + "=" * 40
+_FILE_SEPARATOR = "\n" + "-" * 40
+_ANALYSIS_INSTRUCTIONS = (
+    "\n\nPlease analyze the above code changes and return your findings in JSON format.\n"
+    "Focus on issues relevant to your specialization.\n"
+    "Return an empty array if no issues are found."
+)
+
+# Characters that affect JSON array nesting when scanning a streamed response
+_JSON_STRUCTURE_RE = re.compile(r'[\[\]"\\]')
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps_indented(value: Any) -> str:
+    """Serialize a value as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(value, indent=2)
+
+
+def _format_custom_rules(custom_rules: Dict[str, Any]) -> str:
+    """Format custom rules for inclusion in prompt"""
+    rules_text = []
+    for key, value in custom_rules.items():
+        if isinstance(value, (list, dict)):
+            value = _json_dumps_indented(value)
+        rules_text.append(f"- {key}: {value}")
+    return "\n".join(rules_text)
+
+
+class _JsonArrayScanner:
+    """Incrementally finds the first complete top-level JSON array in streamed text"""
+    
+    __slots__ = ('_pos', '_start', '_depth', '_in_string', '_escaped_at')
+    
+    def __init__(self):
+        self._pos = 0  # Next buffer offset to scan
+        self._start = None  # Buffer offset of the opening '['
+        self._depth = 0
+        self._in_string = False
+        self._escaped_at = -1  # Offset of the character following a backslash
+    
+    def scan(self, buffer: str) -> Optional[str]:
+        """
+        Scan text appended to the buffer since the last call
+        
+        Args:
+            buffer: Everything received so far
+            
+        Returns:
+            The complete JSON array text, or None if it hasn't closed yet
+        """
+        for match in _JSON_STRUCTURE_RE.finditer(buffer, self._pos):
+            index = match.start()
+            if index == self._escaped_at:
+                continue
+            
+            char = match.group()
+            if self._in_string:
+                if char == '\\':
+                    self._escaped_at = index + 1
+                elif char == '"':
+                    self._in_string = False
+            elif self._start is None:
+                # Prose before the array may contain quotes; only '[' matters
+                if char == '[':
+                    self._start = index
+                    self._depth = 1
+            elif char == '"':
+                self._in_string = True
+            elif char == '[':
+                self._depth += 1
+            elif char == ']':
+                self._depth -= 1
+                if self._depth == 0:
+                    candidate = buffer[self._start:index + 1]
+                    try:
+                        parsed = _json_loads(candidate)
+                    except ValueError:
+                        parsed = None
+                    
+                    # Findings are objects; brackets in prose or lists like
+                    # [12, 15] aren't the findings array - keep looking
+                    if isinstance(parsed, list) and all(isinstance(item, dict) for item in parsed):
+                        return candidate
+                    self._start = None
+        
+        self._pos = len(buffer)
+        return None
+
 
 class AgentConfig:
     """Configuration for analyzer agents"""
     
+    __slots__ = (
+        'max_tokens', 'temperature', 'timeout', 'max_retries',
+        'custom_rules', 'formatted_rules', 'prompt_cache_control',
+        'max_inflight', '_llm_semaphore', 'response_cache', 'findings_cache',
+        'stream_responses', 'files_per_call', 'skip_trivial_changes',
+        'requests_per_minute', '_rate_limiter'
+    )
+    
+    # Default in-flight limits, shared by every config with the same
+    # max_inflight so concurrent reviews are bounded together. asyncio
+    # primitives belong to one event loop, so each loop gets its own.
+    _shared_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, asyncio.Semaphore]]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _shared_rate_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, RateLimiter]]" = (
+        weakref.WeakKeyDictionary()
+    )
+    
     def __init__(
         self,
         max_tokens: int = 4000,  # Increased for more detailed analysis
         temperature: float = 0.1,
         timeout: int = 300,  # 5 minutes per agent
         max_retries: int = 2,
-        custom_rules: Optional[Dict[str, Any]] = None
+        custom_rules: Optional[Dict[str, Any]] = None,
+        prompt_cache_control: Optional[bool] = None,  # Anthropic-style cache_control blocks; None = detect from the LLM
+        max_inflight: int = 8,  # Concurrent LLM requests shared by agents using this config
+        llm_semaphore: Optional[asyncio.Semaphore] = None,
+        cache_responses: bool = True,
+        response_cache: Optional[ResponseCache] = None,
+        stream_responses: bool = True,  # Stop reading once the findings array is complete
+        files_per_call: int = 8,  # Files per LLM request; larger PRs are split and analyzed concurrently
+        skip_trivial_changes: bool = True,  # Skip the LLM for whitespace/comment/import/version-only diffs
+        cache_findings: bool = True,
+        findings_cache: Optional[ResponseCache] = None,
+        requests_per_minute: Optional[int] = None,  # Provider quota shared by agents using this config; None = unlimited
+        rate_limiter: Optional[RateLimiter] = None
     ):
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.timeout = timeout
         self.max_retries = max_retries
         self.custom_rules = custom_rules or {}
+        # Rules are fixed for the config's lifetime, so format them once
+        self.formatted_rules = _format_custom_rules(self.custom_rules)
+        self.prompt_cache_control = prompt_cache_control
+        self.max_inflight = max_inflight
+        self._llm_semaphore = llm_semaphore
+        self.response_cache = (response_cache or default_response_cache) if cache_responses else None
+        self.stream_responses = stream_responses
+        self.files_per_call = files_per_call
+        self.skip_trivial_changes = skip_trivial_changes
+        self.findings_cache = (findings_cache or default_findings_cache) if cache_findings else None
+        self.requests_per_minute = requests_per_minute
+        self._rate_limiter = rate_limiter
+    
+    @property
+    def llm_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bounding in-flight LLM requests, shared per event loop unless given"""
+        if self._llm_semaphore is not None:
+            return self._llm_semaphore
+        
+        semaphores = self._shared_semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = semaphores.get(self.max_inflight)
+        if semaphore is None:
+            semaphore = semaphores[self.max_inflight] = asyncio.Semaphore(self.max_inflight)
+        return semaphore
+    
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """Rate limiter for LLM requests, shared per event loop unless given"""
+        if self._rate_limiter is not None or not self.requests_per_minute:
+            return self._rate_limiter
+        
+        limiters = self._shared_rate_limiters.setdefault(asyncio.get_running_loop(), {})
+        limiter = limiters.get(self.requests_per_minute)
+        if limiter is None:
+            limiter = limiters[self.requests_per_minute] = RateLimiter(self.requests_per_minute)
+        return limiter
 
 
 class AnalyzerAgent(ABC):
@@ -47,12 +312,19 @@ class AnalyzerAgent(ABC):
         self.llm = llm
         self.config = config or AgentConfig()
         self.agent_name = self.__class__.__name__.lower().replace('agent', '')
+        self.analysis_category = self.get_analysis_category()
+        self._system_messages: Dict[str, SystemMessage] = {}  # Built on first use, per static guidance
+        self.prompt_cache_hits = 0
         
     @abstractmethod
     async def analyze(self, context: ReviewContext) -> List[Finding]:
         """
         Analyze code changes and return findings
         
+        Agents keep no per-call state, so analyze() calls of different agents
+        can be awaited together with asyncio.gather. LLM requests are bounded
+        by the config's shared semaphore.
+        
         Args:
             context: Review context with file changes and configuration
             
@@ -81,90 +353,274 @@ class AnalyzerAgent(ABC):
         """
         pass
     
-    def create_prompt(self, context: ReviewContext) -> List[BaseMessage]:
+    def create_prompt(
+        self,
+        context: ReviewContext,
+        extra_human_suffix: str = "",
+        static_guidance: str = ""
+    ) -> List[BaseMessage]:
         """
         Create prompt messages for LLM analysis
         
         Args:
             context: Review context with file changes
+            extra_human_suffix: Agent-specific guidance appended to the human message
+            static_guidance: Guidance that doesn't depend on the PR's contents,
+                e.g. per-language guidelines, sent after the system prompt
             
         Returns:
             List of messages for the LLM
         """
-        # System message with agent-specific instructions
-        system_prompt = self.get_system_prompt()
-        
-        # Add custom rules if available
-        if self.config.custom_rules:
-            custom_rules_text = self._format_custom_rules(self.config.custom_rules)
-            system_prompt += f"\n\nCustom Rules:\n{custom_rules_text}"
-        
-        messages = [SystemMessage(content=system_prompt)]
+        # System message holds only the static agent instructions so the
+        # prompt prefix stays byte-identical across calls and can be served
+        # from the provider's prompt cache
+        messages = [self._create_system_message(static_guidance)]
         
         # Human message with code changes
-        human_prompt = self._create_human_prompt(context)
+        human_prompt = self._create_human_prompt(context, extra_human_suffix)
         messages.append(HumanMessage(content=human_prompt))
         
         return messages
     
-    def _create_human_prompt(self, context: ReviewContext) -> str:
-        """Create human prompt with code changes"""
-        prompt_parts = []
+    def split_context(self, context: ReviewContext) -> List[ReviewContext]:
+        """
+        Split a review context into batches of at most files_per_call files
+        
+        Args:
+            context: Review context with file changes
+            
+        Returns:
+            Contexts sharing the same config and PR metadata, one per batch
+        """
+        files = context.file_changes
+        batch_size = self.config.files_per_call
+        if not batch_size or len(files) <= batch_size:
+            return [context]
+        
+        return [
+            context.model_copy(update={'file_changes': files[start:start + batch_size]})
+            for start in range(0, len(files), batch_size)
+        ]
+    
+    async def _analyze_in_batches(
+        self,
+        context: ReviewContext,
+        analyze_batch: Callable[[ReviewContext], Awaitable[List[Finding]]]
+    ) -> List[Finding]:
+        """
+        Run analyze_batch over each file batch concurrently and merge the findings
+        
+        Every batch shares the same system prompt, so after the first call the
+        prompt prefix is served from the provider's cache.
+        
+        Args:
+            context: Review context with file changes
+            analyze_batch: Coroutine producing raw findings for one batch
+            
+        Returns:
+            Findings from all batches
+        """
+        batches = self.split_context(context)
+        if len(batches) == 1:
+            return await self._analyze_batch_cached(context, analyze_batch)
+        
+        logger.info(f"[{self.agent_name}] Analyzing {len(context.file_changes)} files in {len(batches)} batches")
+        results = await asyncio.gather(*(self._analyze_batch_cached(batch, analyze_batch) for batch in batches))
+        return [finding for batch_findings in results for finding in batch_findings]
+    
+    async def _analyze_batch_cached(
+        self,
+        batch: ReviewContext,
+        analyze_batch: Callable[[ReviewContext], Awaitable[List[Finding]]]
+    ) -> List[Finding]:
+        """Analyze one batch, reusing findings for identical file changes"""
+        cache = self.config.findings_cache
+        if cache is None:
+            return await analyze_batch(batch)
+        
+        cache_key = self._findings_cache_key(batch)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"[{self.agent_name}] Findings cache hit for {len(batch.file_changes)} files")
+            # Copies, since validation updates findings in place
+            return [finding.model_copy() for finding in cached]
+        
+        findings = await analyze_batch(batch)
+        cache.set(cache_key, [finding.model_copy() for finding in findings])
+        return findings
+    
+    def _findings_cache_key(self, batch: ReviewContext) -> str:
+        """Hash everything about a batch that determines its findings"""
+        digest = hashlib.blake2b(digest_size=32)
+        digest.update(
+            f"{PROMPT_VERSION}|{self.agent_name}|{self._get_model_name()}|{self.config.temperature}|"
+            f"{self.config.max_tokens}|{self.config.formatted_rules}|".encode()
+        )
+        digest.update(self.get_system_prompt().encode())
+        
+        for file_change in sorted(batch.file_changes, key=lambda f: f.file_path):
+            digest.update(f"\0{file_change.file_path}\0{file_change.language}\0{file_change.is_binary}".encode())
+            for marker, lines in (("+", file_change.additions), ("-", file_change.deletions), ("~", file_change.modifications)):
+                for line in lines:
+                    digest.update(f"\n{marker}{line.line_number}:{line.content}".encode())
+        
+        return digest.hexdigest()
+    
+    async def analyze_many(self, contexts: List[ReviewContext]) -> List[List[Finding]]:
+        """
+        Analyze several review contexts, packing small ones into shared LLM calls
+        
+        Contexts with the same review config are packed together up to
+        files_per_call files, as long as their file paths don't collide, so a
+        burst of small reviews costs fewer LLM round-trips. Findings are
+        routed back to the context that owns their file.
+        
+        Args:
+            contexts: Review contexts to analyze
+            
+        Returns:
+            Findings for each context, in input order
+        """
+        packs = self._pack_contexts(contexts)
+        results = await asyncio.gather(*(self.analyze(packed) for packed, _ in packs))
+        
+        findings_per_context = [[] for _ in contexts]
+        for (_, owners), findings in zip(packs, results):
+            for finding in findings:
+                owner = owners.get(finding.file_path)
+                if owner is not None:
+                    findings_per_context[owner].append(finding)
+        
+        return findings_per_context
+    
+    def _pack_contexts(self, contexts: List[ReviewContext]) -> List[Tuple[ReviewContext, Dict[str, int]]]:
+        """Pack contexts into combined contexts, each with a map of file path to owning context index"""
+        batch_size = self.config.files_per_call
+        packs = []
+        open_packs = {}  # Review config JSON -> pack still accepting contexts
+        
+        for index, context in enumerate(contexts):
+            config_key = context.config.model_dump_json()
+            paths = [f.file_path for f in context.file_changes]
+            pack = open_packs.get(config_key)
+            
+            if (
+                pack is None
+                or (batch_size and len(pack['files']) + len(paths) > batch_size)
+                or any(path in pack['owners'] for path in paths)
+            ):
+                pack = {'config': context.config, 'files': [], 'owners': {}, 'members': []}
+                packs.append(pack)
+                open_packs[config_key] = pack
+            
+            pack['files'].extend(context.file_changes)
+            pack['owners'].update((path, index) for path in paths)
+            pack['members'].append(index)
+        
+        return [
+            (
+                ReviewContext(
+                    file_changes=pack['files'],
+                    config=pack['config'],
+                    # PR metadata only describes a pack made of a single review
+                    pr_metadata=contexts[pack['members'][0]].pr_metadata if len(pack['members']) == 1 else None
+                ),
+                pack['owners']
+            )
+            for pack in packs
+        ]
+    
+    def _create_system_message(self, static_guidance: str = "") -> SystemMessage:
+        """Create the static system message, marked as a cache breakpoint if enabled"""
+        system_message = self._system_messages.get(static_guidance)
+        if system_message is None:
+            system_prompt = self.get_system_prompt()
+            
+            if self._use_cache_control():
+                # Separate breakpoints keep the system prompt cached even
+                # when the guidance differs between requests
+                blocks = [system_prompt]
+                if static_guidance:
+                    blocks.append(static_guidance)
+                system_message = SystemMessage(content=[
+                    {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+                    for text in blocks
+                ])
+            elif static_guidance:
+                system_message = SystemMessage(content=f"{system_prompt}\n\n{static_guidance}")
+            else:
+                system_message = SystemMessage(content=system_prompt)
+            
+            self._system_messages[static_guidance] = system_message
+        
+        return system_message
+    
+    def _use_cache_control(self) -> bool:
+        """Whether to mark the system prompt with an explicit cache breakpoint"""
+        if self.config.prompt_cache_control is not None:
+            return self.config.prompt_cache_control
+        
+        # Anthropic only caches explicitly marked prefixes; OpenAI-compatible
+        # providers such as NIM cache identical prefixes automatically
+        llm_type = type(self.llm)
+        return 'anthropic' in f"{llm_type.__module__}.{llm_type.__name__}".lower()
+    
+    def _create_human_prompt(self, context: ReviewContext, extra_human_suffix: str = "") -> str:
+        """Create human prompt with code changes, custom rules and any agent-specific suffix"""
+        buf = io.StringIO()
         
         # Add context information
         if context.pr_metadata:
-            prompt_parts.append(f"Pull Request: {context.pr_metadata.title}")
-            prompt_parts.append(f"Repository: {context.pr_metadata.repository}")
-            prompt_parts.append(f"Author: {context.pr_metadata.author}")
-            prompt_parts.append("")
+            buf.write(
+                f"Pull Request: {context.pr_metadata.title}\n"
+                f"Repository: {context.pr_metadata.repository}\n"
+                f"Author: {context.pr_metadata.author}\n\n"
+            )
         
         # Add file changes
-        prompt_parts.append("Code Changes to Analyze:")
-        prompt_parts.append("=" * 40)
+        buf.write(_CHANGES_HEADER)
         
         for file_change in context.file_changes:
             if file_change.is_binary:
-                prompt_parts.append(f"\nFile: {file_change.file_path} (binary file - skipped)")
+                buf.write(f"\n\nFile: {file_change.file_path} (binary file - skipped)")
                 continue
             
-            prompt_parts.append(f"\nFile: {file_change.file_path}")
-            prompt_parts.append(f"Language: {file_change.language}")
+            buf.write(f"\n\nFile: {file_change.file_path}\nLanguage: {file_change.language}")
             
             # Add additions
             if file_change.additions:
-                prompt_parts.append("\nAdditions:")
-                for line_change in file_change.additions:
-                    prompt_parts.append(f"+{line_change.line_number}: {line_change.content}")
+                buf.write("\n\nAdditions:\n")
+                buf.write("\n".join(f"+{line.line_number}: {line.content}" for line in file_change.additions))
             
             # Add deletions
             if file_change.deletions:
-                prompt_parts.append("\nDeletions:")
-                for line_change in file_change.deletions:
-                    prompt_parts.append(f"-{line_change.line_number}: {line_change.content}")
+                buf.write("\n\nDeletions:\n")
+                buf.write("\n".join(f"-{line.line_number}: {line.content}" for line in file_change.deletions))
             
-            # Add modifications
+            # Add modifications, skipping lines the diff parser already reported as additions
             if file_change.modifications:
-                prompt_parts.append("\nModifications:")
-                for line_change in file_change.modifications:
-                    prompt_parts.append(f"~{line_change.line_number}: {line_change.content}")
+                added = {(line.line_number, line.content) for line in file_change.additions}
+                modifications = [
+                    line for line in file_change.modifications
+                    if (line.line_number, line.content) not in added
+                ]
+                if modifications:
+                    buf.write("\n\nModifications:\n")
+                    buf.write("\n".join(f"~{line.line_number}: {line.content}" for line in modifications))
             
-            prompt_parts.append("-" * 40)
+            buf.write(_FILE_SEPARATOR)
         
         # Add analysis instructions
-        prompt_parts.append("\nPlease analyze the above code changes and return your findings in JSON format.")
-        prompt_parts.append("Focus on issues relevant to your specialization.")
-        prompt_parts.append("Return an empty array if no issues are found.")
+        buf.write(_ANALYSIS_INSTRUCTIONS)
         
-        return "\n".join(prompt_parts)
-    
-    def _format_custom_rules(self, custom_rules: Dict[str, Any]) -> str:
-        """Format custom rules for inclusion in prompt"""
-        rules_text = []
-        for key, value in custom_rules.items():
-            if isinstance(value, (list, dict)):
-                value = json.dumps(value, indent=2)
-            rules_text.append(f"- {key}: {value}")
-        return "\n".join(rules_text)
+        # Custom rules are per-review, so they go after the code changes
+        if self.config.formatted_rules:
+            buf.write(f"\n\nCustom Rules:\n{self.config.formatted_rules}")
+        
+        if extra_human_suffix:
+            buf.write(f"\n\n{extra_human_suffix}")
+        
+        return buf.getvalue()
     
     async def parse_llm_response(self, response: str) -> List[Finding]:
         """
@@ -183,8 +639,8 @@ class AnalyzerAgent(ABC):
             # Clean the response - remove markdown code blocks if present
             cleaned_response = self._clean_json_response(response)
             
-            # Parse JSON
-            findings_data = json.loads(cleaned_response)
+            # Parse JSON (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+            findings_data = _json_loads(cleaned_response)
             
             # Ensure it's a list
             if not isinstance(findings_data, list):
@@ -215,31 +671,11 @@ class AnalyzerAgent(ABC):
     
     def _clean_json_response(self, response: str) -> str:
         """Clean LLM response to extract JSON content"""
-        # Remove markdown code blocks
-        if "```json" in response:
-            start = response.find("```json") + 7
-            end = response.find("```", start)
-            if end != -1:
-                response = response[start:end].strip()
-        elif "```" in response:
-            start = response.find("```") + 3
-            end = response.find("```", start)
-            if end != -1:
-                response = response[start:end].strip()
-        
-        # Remove any leading/trailing whitespace
-        response = response.strip()
-        
-        # If response doesn't start with [ or {, try to find JSON content
-        if not response.startswith(('[', '{')):
-            # Look for JSON array or object in the response
-            for char in ['[', '{']:
-                start_idx = response.find(char)
-                if start_idx != -1:
-                    response = response[start_idx:]
-                    break
-        
-        return response
+        match = _JSON_CONTENT_RE.match(response)
+        if not match:
+            return response.strip()
+        
+        return (match.group('fenced') or match.group('bare') or response).strip()
     
     def _create_finding_from_dict(self, data: Dict[str, Any]) -> Optional[Finding]:
         """Create Finding object from dictionary data"""
@@ -252,10 +688,9 @@ class AnalyzerAgent(ABC):
                     return None
             
             # Parse severity
-            severity_str = data.get('severity', 'medium').lower()
-            try:
-                severity = SeverityLevel(severity_str)
-            except ValueError:
+            severity_str = str(data.get('severity', 'medium')).lower()
+            severity = _SEVERITY_BY_VALUE.get(severity_str)
+            if severity is None:
                 logger.warning(f"Invalid severity '{severity_str}', defaulting to medium")
                 severity = SeverityLevel.MEDIUM
             
@@ -264,7 +699,7 @@ class AnalyzerAgent(ABC):
                 file_path=str(data['file_path']),
                 line_number=int(data['line_number']),
                 severity=severity,
-                category=self.get_analysis_category(),
+                category=self.analysis_category,
                 description=str(data['description']),
                 suggestion=data.get('suggestion'),
                 agent_source=self.agent_name
@@ -278,7 +713,53 @@ class AnalyzerAgent(ABC):
     
     async def _invoke_llm_with_retry(self, messages: List[BaseMessage]) -> str:
         """
-        Invoke LLM with retry logic
+        Invoke LLM with retry logic, serving identical requests from the response cache
+        or from the same in-flight call
+        
+        Args:
+            messages: Messages to send to LLM
+            
+        Returns:
+            LLM response text
+            
+        Raises:
+            Exception: If all retries fail
+        """
+        cache = self.config.response_cache
+        cache_key = ResponseCache.make_key(
+            messages,
+            model=self._get_model_name(),
+            temperature=self.config.temperature,
+            max_tokens=self.config.max_tokens,
+            prompt_version=PROMPT_VERSION
+        )
+        
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"[{self.agent_name}] Response cache hit - skipping LLM call")
+                return cached
+        
+        async def call_and_cache() -> str:
+            content = await self._call_llm_with_retry(messages)
+            if content and cache is not None:
+                cache.set(cache_key, content)
+            return content
+        
+        # Share the call with any identical request already in flight
+        return await default_single_flight.do(cache_key, call_and_cache)
+    
+    def _get_model_name(self) -> str:
+        """Get the model identifier used for cache keys"""
+        return (
+            getattr(self.llm, 'model', None)
+            or getattr(self.llm, 'model_name', None)
+            or type(self.llm).__name__
+        )
+    
+    async def _call_llm_with_retry(self, messages: List[BaseMessage]) -> str:
+        """
+        Call the LLM, retrying on failure
         
         Args:
             messages: Messages to send to LLM
@@ -303,11 +784,24 @@ class AnalyzerAgent(ABC):
                 
                 logger.debug(f"[{self.agent_name}] LLM call attempt {attempt + 1} with params: {llm_kwargs}")
                 
-                # Invoke LLM
-                response = await self.llm.ainvoke(messages, **llm_kwargs)
+                # Retries draw from the same quota, so failures can't flood the provider
+                if self.config.rate_limiter is not None:
+                    await self.config.rate_limiter.acquire()
+                
+                # Invoke LLM, bounded by the in-flight limit shared across agents
+                async with self.config.llm_semaphore:
+                    if self.config.stream_responses and hasattr(self.llm, 'astream'):
+                        content = await self._stream_llm(messages, llm_kwargs)
+                        logger.info(f"[{self.agent_name}] LLM responded successfully")
+                        logger.debug(f"[{self.agent_name}] Streamed response length: {len(content)} characters")
+                        return content
+                    
+                    response = await self.llm.ainvoke(messages, **llm_kwargs)
                 
                 logger.info(f"[{self.agent_name}] LLM responded successfully")
                 
+                self._record_prompt_cache_hit(response)
+                
                 # Extract content from response
                 if hasattr(response, 'content'):
                     content = response.content
@@ -322,10 +816,12 @@ class AnalyzerAgent(ABC):
                 last_exception = e
                 logger.error(f"[{self.agent_name}] LLM invocation error: {type(e).__name__}: {str(e)}")
                 if attempt < self.config.max_retries:
-                    logger.warning(f"[{self.agent_name}] Retrying (attempt {attempt + 1}/{self.config.max_retries})...")
-                    # Simple backoff - wait 1 second between retries
-                    import asyncio
-                    await asyncio.sleep(1.0)
+                    delay = self._get_retry_delay(e, attempt)
+                    logger.warning(
+                        f"[{self.agent_name}] Retrying in {delay:.2f}s "
+                        f"(attempt {attempt + 1}/{self.config.max_retries})..."
+                    )
+                    await asyncio.sleep(delay)
                 else:
                     logger.error(f"[{self.agent_name}] All retry attempts exhausted")
         
@@ -333,6 +829,89 @@ class AnalyzerAgent(ABC):
         logger.error(f"[{self.agent_name}] LLM invocation completely failed")
         raise last_exception or Exception("LLM invocation failed")
     
+    def _get_retry_delay(self, error: Exception, attempt: int) -> float:
+        """
+        Get the delay before the next retry
+        
+        Honors a Retry-After hint carried by the error, otherwise uses
+        exponential backoff with jitter so agents don't retry in lockstep.
+        
+        Args:
+            error: Exception raised by the failed attempt
+            attempt: Zero-based attempt number that failed
+            
+        Returns:
+            Delay in seconds
+        """
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is None:
+            headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+            try:
+                retry_after = float(headers.get('retry-after'))
+            except (TypeError, ValueError):
+                retry_after = None
+        
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), _MAX_RETRY_AFTER)
+        
+        return min(_MAX_RETRY_BACKOFF, _BASE_RETRY_BACKOFF * 2 ** attempt) * (0.5 + random.random())
+    
+    async def _stream_llm(self, messages: List[BaseMessage], llm_kwargs: Dict[str, Any]) -> str:
+        """
+        Stream the LLM response, stopping as soon as the findings array is complete
+        
+        Args:
+            messages: Messages to send to LLM
+            llm_kwargs: Generation parameters
+            
+        Returns:
+            The findings array if one closed early, otherwise the full response text
+        """
+        buffer = ""
+        scanner = _JsonArrayScanner()
+        stream = self.llm.astream(messages, **llm_kwargs)
+        
+        try:
+            async for chunk in stream:
+                self._record_prompt_cache_hit(chunk)
+                
+                text = getattr(chunk, 'content', chunk)
+                if not isinstance(text, str):
+                    text = "".join(
+                        block.get('text', '') if isinstance(block, dict) else str(block)
+                        for block in text
+                    )
+                if not text:
+                    continue
+                
+                buffer += text
+                findings_json = scanner.scan(buffer)
+                if findings_json is not None:
+                    # Drop the trailing fence/prose; closing the stream aborts the request
+                    logger.debug(f"[{self.agent_name}] Findings array complete, ending stream early")
+                    return findings_json
+        finally:
+            if hasattr(stream, 'aclose'):
+                await stream.aclose()
+        
+        return buffer
+    
+    def _record_prompt_cache_hit(self, response: Any):
+        """Count responses whose prompt prefix was served from the provider's cache"""
+        cached_tokens = self._get_cached_prompt_tokens(response)
+        if cached_tokens:
+            self.prompt_cache_hits += 1
+            logger.debug(f"[{self.agent_name}] Prompt cache hit: {cached_tokens} cached input tokens")
+    
+    def _get_cached_prompt_tokens(self, response: Any) -> int:
+        """Get number of input tokens served from the provider's prompt cache"""
+        usage = getattr(response, 'usage_metadata', None)
+        if not isinstance(usage, dict):
+            return 0
+        
+        details = usage.get('input_token_details') or {}
+        return details.get('cache_read') or 0
+    
     def get_expected_output_format(self) -> str:
         """Get description of expected JSON output format"""
         return """
@@ -364,33 +943,52 @@ Return an empty array [] if no issues are found.
             logger.debug("No file changes to analyze")
             return False
         
-        # Check if there are any non-binary files to analyze
-        text_files = [f for f in context.file_changes if not f.is_binary]
-        if not text_files:
-            logger.debug("No text files to analyze (all binary)")
-            return False
-        
-        # Check if any files have actual changes
-        has_changes = any(
-            f.additions or f.deletions or f.modifications 
-            for f in text_files
-        )
+        # Single pass that stops at the first text file with a substantive change
+        check_trivial = self.config.skip_trivial_changes
+        has_text_files = False
+        has_changes = False
+        for file_change in context.file_changes:
+            if file_change.is_binary:
+                continue
+            has_text_files = True
+            
+            if file_change.additions or file_change.deletions or file_change.modifications:
+                has_changes = True
+                if not check_trivial or not self._is_trivial_change(file_change):
+                    return True
         
-        if not has_changes:
+        if not has_text_files:
+            logger.debug("No text files to analyze (all binary)")
+        elif not has_changes:
             logger.debug("No actual code changes to analyze")
-            return False
+        else:
+            # Fast path: nothing an LLM could flag, so skip the round-trip entirely
+            logger.debug("Only whitespace, comment, import or version changes - skipping analysis")
         
-        return True
+        return False
+    
+    def _is_trivial_change(self, file_change: FileChange) -> bool:
+        """Check whether every added, deleted and modified line in a file is trivial"""
+        trivial_line_re = _TRIVIAL_LINE_RES.get(file_change.language, _DEFAULT_TRIVIAL_LINE_RE)
+        fullmatch = trivial_line_re.fullmatch
+        return all(
+            fullmatch(line.content)
+            for lines in (file_change.additions, file_change.deletions, file_change.modifications)
+            for line in lines
+        )
     
     def get_agent_info(self) -> Dict[str, Any]:
         """Get information about this agent"""
         return {
             'name': self.agent_name,
-            'category': self.get_analysis_category().value,
+            'category': self.analysis_category.value,
             'config': {
                 'max_tokens': self.config.max_tokens,
                 'temperature': self.config.temperature,
                 'timeout': self.config.timeout,
-                'max_retries': self.config.max_retries
-            }
+                'max_retries': self.config.max_retries,
+                'max_inflight': self.config.max_inflight,
+                'files_per_call': self.config.files_per_call
+            },
+            'prompt_cache_hits': self.prompt_cache_hits
         }
\ No newline at end of file
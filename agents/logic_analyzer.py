@@ -2,6 +2,7 @@
 Logic Analyzer Agent for detecting logical errors and bugs
 """
 import logging
+import re
 from typing import List
 
 from langchain_core.language_models import BaseLanguageModel
@@ -11,6 +12,27 @@ from models import Finding, ReviewContext, AnalysisCategory
 
 logger = logging.getLogger(__name__)
 
+_C_HINT = "- C/C++: Check pointer dereferencing, memory management, buffer overflows"
+
+# Language-specific guidance, in the order it appears in the prompt
+_LANG_HINTS = {
+    "python": "- Python: Watch for None checks, list/dict key errors, indentation logic",
+    "javascript": "- JavaScript: Check for undefined/null, type coercion issues, async/await problems",
+    "java": "- Java: Look for NullPointerException, array bounds, resource management",
+    "cpp": _C_HINT,
+    "c": _C_HINT,
+    "go": "- Go: Watch for nil pointer dereference, goroutine race conditions",
+    "rust": "- Rust: Focus on Option/Result handling, borrowing issues",
+}
+
+# Classifies a lowercased file path in one match; alternatives are tried in
+# priority order and the matched group name is the file type
+_FILE_TYPE_RE = re.compile(
+    r"^(?:(?=.*test)(?P<test>)"
+    r"|(?=.*(?:config|setting))(?P<config>)"
+    r"|(?=.*(?:util|helper))(?P<utility>))"
+)
+
 
 class LogicAnalyzerAgent(AnalyzerAgent):
     """Analyzer agent specialized in detecting logical errors and bugs"""
@@ -32,85 +54,23 @@ class LogicAnalyzerAgent(AnalyzerAgent):
     
     def get_system_prompt(self) -> str:
         """Get the system prompt for logic analysis"""
-        return """You are an expert code reviewer specializing in logical errors and bugs. Your task is to analyze code changes and identify potential logical issues that could cause runtime errors, incorrect behavior, or crashes.
-
-Focus on detecting these types of logical issues:
-
-1. **Null Pointer Dereferences**:
-   - Accessing properties/methods on potentially null/undefined variables
-   - Missing null checks before object access
-   - Dereferencing pointers without validation
-
-2. **Unreachable Code**:
-   - Code after return statements
-   - Code in impossible conditional branches
-   - Dead code that can never be executed
-
-3. **Infinite Loops and Off-by-One Errors**:
-   - Loop conditions that never become false
-   - Incorrect loop bounds (< vs <=, > vs >=)
-   - Missing loop variable updates
-   - Array/list index out of bounds
+        return """You are an expert code reviewer specializing in logical errors and bugs. Analyze the code changes and report logical issues that could cause runtime errors, incorrect behavior, or crashes.
 
-4. **Incorrect Parameter Usage**:
-   - Wrong number of arguments in function calls
-   - Type mismatches in parameters
-   - Missing required parameters
-   - Incorrect parameter order
+Look for:
+1. Null dereferences: accessing possibly null/undefined values, missing null checks, unvalidated pointers
+2. Unreachable code: code after return, impossible branches, dead code
+3. Loops and bounds: non-terminating loops, off-by-one bounds (< vs <=), missing loop updates, index out of bounds
+4. Parameter misuse: wrong argument count, order or type, missing required arguments
+5. Logic flow: missing returns, wrong operators or conditions, race conditions, resource leaks
+6. Data types: overflow/underflow, division by zero, bad conversions, string/array bounds
+7. Exception handling: unhandled risky operations, overly broad catches, unhandled error cases
 
-5. **Logic Flow Issues**:
-   - Missing return statements in non-void functions
-   - Incorrect conditional logic (wrong operators, missing conditions)
-   - Race conditions in concurrent code
-   - Resource leaks (unclosed files, connections, etc.)
+Guidelines: report only logical correctness (not style or performance), give the exact line number, explain why it is a problem, suggest a concrete fix, account for the language, and flag only clear errors.
 
-6. **Data Type Issues**:
-   - Integer overflow/underflow
-   - Division by zero
-   - Incorrect type conversions
-   - String/array bounds violations
+Severity: critical = will crash or corrupt data; high = likely runtime error or wrong behavior; medium = fails under some conditions; low = minor inconsistency.
 
-7. **Exception Handling**:
-   - Missing error handling for risky operations
-   - Catching too broad exceptions
-   - Not handling specific error cases
-
-**Analysis Guidelines**:
-- Focus ONLY on logical correctness, not style or performance
-- Provide specific line numbers where issues occur
-- Explain WHY the code is problematic
-- Suggest concrete fixes when possible
-- Consider the programming language context
-- Be conservative - only flag clear logical errors
-
-**Severity Levels**:
-- **Critical**: Will definitely cause crashes or data corruption
-- **High**: Likely to cause runtime errors or incorrect behavior
-- **Medium**: Could cause issues under certain conditions
-- **Low**: Minor logical inconsistencies
-
-**Output Format**:
-Return findings as a JSON array. Each finding must include:
-- file_path: The file containing the issue
-- line_number: The specific line with the problem
-- severity: One of "critical", "high", "medium", "low"
-- description: Clear explanation of the logical issue
-- suggestion: Specific recommendation for fixing the issue
-
-Example:
-```json
-[
-  {
-    "file_path": "src/calculator.py",
-    "line_number": 15,
-    "severity": "critical",
-    "description": "Division by zero error: variable 'denominator' is not checked for zero before division",
-    "suggestion": "Add a check: if denominator == 0: raise ValueError('Division by zero')"
-  }
-]
-```
-
-Return an empty array [] if no logical issues are found."""
+Each finding needs file_path, line_number, severity, description and suggestion.
+""" + self.get_expected_output_format()
 
     async def analyze(self, context: ReviewContext) -> List[Finding]:
         """
@@ -128,17 +88,8 @@ Return an empty array [] if no logical issues are found."""
             return []
         
         try:
-            # Create prompt messages
-            messages = self.create_prompt(context)
-            
-            # Add logic-specific context to the human message
-            enhanced_messages = self._enhance_prompt_with_logic_context(messages, context)
-            
-            # Invoke LLM with retry
-            response = await self._invoke_llm_with_retry(enhanced_messages)
-            
-            # Parse response into findings
-            findings = await self.parse_llm_response(response)
+            # Analyze files in batches sized to fit one LLM call each
+            findings = await self._analyze_in_batches(context, self._analyze_batch)
             
             # Filter and validate findings
             validated_findings = self._validate_logic_findings(findings, context)
@@ -150,21 +101,18 @@ Return an empty array [] if no logical issues are found."""
             logger.error(f"Logic analysis failed: {e}")
             return []
     
-    def _enhance_prompt_with_logic_context(self, messages, context: ReviewContext):
-        """Enhance prompt with logic-specific context"""
-        # Get the human message (last message)
-        human_message = messages[-1]
+    async def _analyze_batch(self, context: ReviewContext) -> List[Finding]:
+        """Analyze one batch of file changes and return the unvalidated findings"""
+        # Create prompt messages with logic-specific context in the human message
+        messages = self.create_prompt(context, extra_human_suffix=self._build_logic_context(context))
         
-        # Add logic-specific instructions
-        logic_context = self._build_logic_context(context)
+        # Invoke LLM with retry
+        response = await self._invoke_llm_with_retry(messages)
         
-        enhanced_content = f"{human_message.content}\n\n{logic_context}"
+        # Parse response into findings
+        findings = await self.parse_llm_response(response)
         
-        # Replace the human message with enhanced version
-        from langchain_core.messages import HumanMessage
-        messages[-1] = HumanMessage(content=enhanced_content)
-        
-        return messages
+        return findings
     
     def _build_logic_context(self, context: ReviewContext) -> str:
         """Build logic-specific analysis context"""
@@ -172,22 +120,10 @@ Return an empty array [] if no logical issues are found."""
         
         # Language-specific guidance
         languages = set(f.language for f in context.file_changes if not f.is_binary)
+        lang_hints = dict.fromkeys(hint for lang, hint in _LANG_HINTS.items() if lang in languages)
         if languages:
             context_parts.append("**Language-Specific Considerations:**")
-            
-            for lang in languages:
-                if lang == "python":
-                    context_parts.append("- Python: Watch for None checks, list/dict key errors, indentation logic")
-                elif lang == "javascript":
-                    context_parts.append("- JavaScript: Check for undefined/null, type coercion issues, async/await problems")
-                elif lang == "java":
-                    context_parts.append("- Java: Look for NullPointerException, array bounds, resource management")
-                elif lang == "cpp" or lang == "c":
-                    context_parts.append("- C/C++: Check pointer dereferencing, memory management, buffer overflows")
-                elif lang == "go":
-                    context_parts.append("- Go: Watch for nil pointer dereference, goroutine race conditions")
-                elif lang == "rust":
-                    context_parts.append("- Rust: Focus on Option/Result handling, borrowing issues")
+            context_parts.extend(lang_hints)
         
         # Analysis focus based on change types
         has_additions = any(f.additions for f in context.file_changes)
@@ -204,17 +140,11 @@ Return an empty array [] if no logical issues are found."""
         file_types = set()
         for file_change in context.file_changes:
             if not file_change.is_binary:
-                if "test" in file_change.file_path.lower():
-                    file_types.add("test")
-                elif any(keyword in file_change.file_path.lower() for keyword in ["config", "setting"]):
-                    file_types.add("config")
-                elif any(keyword in file_change.file_path.lower() for keyword in ["util", "helper"]):
-                    file_types.add("utility")
-                else:
-                    file_types.add("application")
+                match = _FILE_TYPE_RE.match(file_change.file_path.lower())
+                file_types.add(match.lastgroup if match else "application")
         
         if file_types:
-            context_parts.append(f"\n**File Types**: {', '.join(file_types)} - adjust analysis accordingly")
+            context_parts.append(f"\n**File Types**: {', '.join(sorted(file_types))} - adjust analysis accordingly")
         
         return "\n".join(context_parts)
     
@@ -222,14 +152,25 @@ Return an empty array [] if no logical issues are found."""
         """Validate and filter logic-specific findings"""
         validated = []
         
+        # Index changed files and their nearby lines once instead of per finding
+        files_by_path = {f.file_path: f for f in context.file_changes}
+        nearby_lines_by_path = {}
+        for file_change in context.file_changes:
+            if file_change.is_binary:
+                continue
+            
+            # Allow some tolerance for nearby lines (context lines); deletions
+            # can't be validated by line number
+            nearby_lines_by_path[file_change.file_path] = frozenset(
+                line.line_number + offset
+                for lines in (file_change.additions, file_change.modifications)
+                for line in lines
+                for offset in range(-3, 4)
+            )
+        
         for finding in findings:
             # Ensure finding is in a file that was actually changed
-            file_exists = any(
-                f.file_path == finding.file_path 
-                for f in context.file_changes
-            )
-            
-            if not file_exists:
+            if finding.file_path not in files_by_path:
                 logger.warning(f"Finding references non-existent file: {finding.file_path}")
                 continue
             
@@ -239,33 +180,10 @@ Return an empty array [] if no logical issues are found."""
                 continue
             
             # Check if line number corresponds to actual changes
-            file_change = next(
-                (f for f in context.file_changes if f.file_path == finding.file_path),
-                None
-            )
-            
-            if file_change and not file_change.is_binary:
-                # Check if the line number is in the changed lines
-                changed_lines = set()
-                
-                # Add all addition line numbers
-                changed_lines.update(line.line_number for line in file_change.additions)
-                
-                # Add all modification line numbers
-                changed_lines.update(line.line_number for line in file_change.modifications)
-                
-                # For deletions, we can't validate line numbers as easily
-                # but we should be more lenient
-                if changed_lines and finding.line_number not in changed_lines:
-                    # Allow some tolerance for nearby lines (context lines)
-                    nearby_lines = any(
-                        abs(finding.line_number - line_num) <= 3 
-                        for line_num in changed_lines
-                    )
-                    
-                    if not nearby_lines:
-                        logger.debug(f"Finding line {finding.line_number} not in changed lines for {finding.file_path}")
-                        # Still include it, but log for debugging
+            nearby_lines = nearby_lines_by_path.get(finding.file_path)
+            if nearby_lines and finding.line_number not in nearby_lines:
+                logger.debug(f"Finding line {finding.line_number} not in changed lines for {finding.file_path}")
+                # Still include it, but log for debugging
             
             # Validate description is meaningful
             if len(finding.description.strip()) < 10:
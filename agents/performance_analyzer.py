@@ -1,17 +1,129 @@
 """
 Performance Analyzer Agent for identifying performance issues and optimization opportunities
 """
+import asyncio
 import logging
 import re
-from typing import List, Dict, Set, Tuple
+from collections import Counter
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Set, Tuple
 
 from langchain_core.language_models import BaseLanguageModel
+from langchain_core.messages import HumanMessage
 
-from agents.base_agent import AnalyzerAgent, AgentConfig
-from models import Finding, ReviewContext, AnalysisCategory
+from agents.base_agent import AnalyzerAgent, AgentConfig, NON_CODE_LANGUAGES
+from agents.regex_engine import compile_pattern
+from models import Finding, FileChange, ReviewContext, AnalysisCategory
 
 logger = logging.getLogger(__name__)
 
+# Each helper's alternatives are combined into one compiled pattern so a line
+# is scanned once instead of once per alternative. The plain alternations
+# run on RE2 when it is installed.
+_DB_QUERY_RE = compile_pattern(
+    # SQL-like patterns
+    r'\b(?:SELECT|INSERT|UPDATE|DELETE|CREATE|DROP)\b'
+    # ORM and database connection patterns
+    r'|\.(?:find|findOne|findAll|save|create|update|delete|query|execute'
+    r'|filter|get|all|first|last|cursor|fetchone|fetchall|commit)\('
+    # Framework-specific patterns
+    r'|(?:query|exec|prepare)\(',
+    re.IGNORECASE
+)
+
+# File operations, network requests and database operations without async
+_SYNC_IO_RE = compile_pattern(
+    r'\b(?:open|read|write|close|requests\.get|requests\.post|urllib|fetch|execute|query|commit)\(',
+    re.IGNORECASE
+)
+
+# Loop-start detection per language; other languages fall back to a keyword search.
+# Word boundaries keep identifiers like "format" or "platform" from matching.
+_BRACE_LOOP_RE = re.compile(r'\b(?:for|while)\s*\(')
+_JS_LOOP_RE = re.compile(r'\b(?:for|while)\s*\(|\bforEach\(')
+_LOOP_START_RES = {
+    "python": re.compile(r'(?:for|while)\b'),
+    "javascript": _JS_LOOP_RE,
+    "typescript": _JS_LOOP_RE,
+    "java": _BRACE_LOOP_RE,
+    "cpp": _BRACE_LOOP_RE,
+    "c": _BRACE_LOOP_RE,
+    "go": re.compile(r'for\b'),
+}
+_DEFAULT_LOOP_START_RE = re.compile(r'\b(?:for|while)\b', re.IGNORECASE)
+
+# Keywords a validated finding must mention. Matched as substrings
+# ("runtime", "optimized", "caching") in a single scan per text.
+_PERFORMANCE_KEYWORDS_RE = re.compile(
+    'performance|slow|inefficient|optimization|complexity|memory|cpu|time|speed|scalability|bottleneck'
+)
+_OPTIMIZATION_KEYWORDS_RE = re.compile(
+    'optimize|improve|cache|batch|async|parallel|index|efficient|faster|reduce|avoid'
+)
+
+# String-concatenation markers per language, checked once a line contains "+="
+_STRING_LITERAL_RES = {
+    "python": re.compile(r'["\']|str', re.IGNORECASE | re.ASCII),
+    "javascript": re.compile(r'["\'`]'),
+    "typescript": re.compile(r'["\'`]'),
+    "java": re.compile(r'String|"'),
+}
+_DEFAULT_STRING_LITERAL_RE = re.compile(r'["\']')
+
+# Language-specific inefficient data structure patterns, in report order
+_DATA_STRUCTURE_RES = {
+    "python": (
+        ("linear_search_in_list", re.compile(r'\A(?!.*\b(?:set|dict)\()(?=.*(?:\bin\s+\w+\s*\[| in ))', re.DOTALL)),
+        ("inefficient_list_operations", re.compile(r'\.insert\(0,|\.pop\(0\)')),
+        ("string_concatenation", re.compile(r'\+=.*str|str.*\+=', re.IGNORECASE | re.ASCII | re.DOTALL)),
+    ),
+}
+_LOOP_WITH_EQUALITY_RE = re.compile(r'for\s+\w+\s+in\s+\w+.*if\s+\w+\s*==')
+
+# Performance idioms reviewed per language, shared by every agent instance
+_PERFORMANCE_PATTERNS = MappingProxyType({
+    "python": (
+        "List comprehensions over loops",
+        "Sets for membership testing",
+        "Generators for large datasets",
+        "String join() over concatenation",
+        "Dictionary lookups over linear search",
+        "Caching expensive computations",
+    ),
+    "javascript": (
+        "Async/await over callbacks",
+        "Event delegation over individual handlers",
+        "Debouncing/throttling for events",
+        "Virtual DOM optimization",
+        "Lazy loading and code splitting",
+        "Web Workers for heavy computation",
+    ),
+    "java": (
+        "Appropriate collection types",
+        "Parallel streams for large datasets",
+        "Connection pooling",
+        "Avoiding autoboxing overhead",
+        "StringBuilder for string building",
+        "Caching and memoization",
+    ),
+    "cpp": (
+        "Move semantics usage",
+        "Memory access optimization",
+        "SIMD instructions",
+        "Cache-friendly data structures",
+        "Avoiding unnecessary copying",
+        "Template specialization",
+    ),
+    "go": (
+        "Buffered channels",
+        "Goroutine pooling",
+        "Memory pool usage (sync.Pool)",
+        "Efficient JSON parsing",
+        "Avoiding memory allocations",
+        "Profiling-guided optimization",
+    ),
+})
+
 
 class PerformanceAnalyzerAgent(AnalyzerAgent):
     """Analyzer agent specialized in identifying performance issues and optimization opportunities"""
@@ -135,22 +247,8 @@ Return an empty array [] if no performance issues are found."""
             return []
         
         try:
-            # Pre-analyze code for performance patterns
-            performance_insights = self._analyze_performance_patterns(context)
-            
-            # Create prompt messages
-            messages = self.create_prompt(context)
-            
-            # Add performance-specific context
-            enhanced_messages = self._enhance_prompt_with_performance_context(
-                messages, context, performance_insights
-            )
-            
-            # Invoke LLM with retry
-            response = await self._invoke_llm_with_retry(enhanced_messages)
-            
-            # Parse response into findings
-            findings = await self.parse_llm_response(response)
+            # Analyze files in batches sized to fit one LLM call each
+            findings = await self._analyze_in_batches(context, self._analyze_batch)
             
             # Filter and validate findings
             validated_findings = self._validate_performance_findings(findings, context)
@@ -162,229 +260,170 @@ Return an empty array [] if no performance issues are found."""
             logger.error(f"Performance analysis failed: {e}")
             return []
     
-    def _analyze_performance_patterns(self, context: ReviewContext) -> Dict[str, any]:
-        """Pre-analyze code for performance anti-patterns"""
-        insights = {
-            "nested_loops": [],
-            "database_queries_in_loops": [],
-            "inefficient_data_structures": [],
-            "string_concatenation_in_loops": [],
-            "redundant_computations": [],
-            "synchronous_io": [],
-            "missing_caching": []
-        }
+    async def _analyze_batch(self, context: ReviewContext) -> List[Finding]:
+        """Analyze one batch of file changes and return the unvalidated findings"""
+        # Pre-analyze code for performance patterns off the event loop so
+        # other agents' LLM calls keep making progress during the scan
+        performance_insights = await asyncio.to_thread(self._analyze_performance_patterns, context)
+        
+        # Create prompt messages
+        messages = self.create_prompt(context)
+        
+        # Add performance-specific context
+        enhanced_messages = self._enhance_prompt_with_performance_context(
+            messages, context, performance_insights
+        )
+        
+        # Invoke LLM with retry
+        response = await self._invoke_llm_with_retry(enhanced_messages)
+        
+        # Parse response into findings
+        findings = await self.parse_llm_response(response)
+        
+        return findings
+    
+    def _analyze_performance_patterns(self, context: ReviewContext) -> Counter:
+        """Pre-analyze code for performance anti-patterns, counting matches per pattern type"""
+        insights = Counter()
         
         for file_change in context.file_changes:
-            if file_change.is_binary:
+            if file_change.is_binary or file_change.language in NON_CODE_LANGUAGES:
                 continue
             
-            # Analyze additions for performance patterns
-            for line_change in file_change.additions:
-                line_content = line_change.content.strip()
-                
-                if not line_content:
-                    continue
-                
-                # Check for nested loops
-                if self._is_loop_start(line_content, file_change.language):
-                    nested_level = self._count_loop_nesting(
-                        file_change.additions, line_change.line_number, file_change.language
-                    )
-                    if nested_level > 1:
-                        insights["nested_loops"].append({
-                            "file": file_change.file_path,
-                            "line": line_change.line_number,
-                            "nesting_level": nested_level
-                        })
-                
-                # Check for database queries in loops
-                if self._contains_database_query(line_content, file_change.language):
-                    if self._is_inside_loop(file_change.additions, line_change.line_number, file_change.language):
-                        insights["database_queries_in_loops"].append({
-                            "file": file_change.file_path,
-                            "line": line_change.line_number,
-                            "query_type": self._identify_query_type(line_content)
-                        })
-                
-                # Check for inefficient data structure usage
-                inefficient_patterns = self._find_inefficient_data_structure_usage(line_content, file_change.language)
-                for pattern in inefficient_patterns:
-                    insights["inefficient_data_structures"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number,
-                        "pattern": pattern
-                    })
-                
-                # Check for string concatenation in loops
-                if self._is_string_concatenation(line_content, file_change.language):
-                    if self._is_inside_loop(file_change.additions, line_change.line_number, file_change.language):
-                        insights["string_concatenation_in_loops"].append({
-                            "file": file_change.file_path,
-                            "line": line_change.line_number
-                        })
-                
-                # Check for synchronous I/O operations
-                if self._is_synchronous_io(line_content, file_change.language):
-                    insights["synchronous_io"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number,
-                        "operation": self._identify_io_operation(line_content)
-                    })
+            insights.update(self._scan_file(file_change))
         
         return insights
     
-    def _is_loop_start(self, line: str, language: str) -> bool:
-        """Check if line starts a loop"""
-        if language == "python":
-            return line.strip().startswith(('for ', 'while '))
-        elif language in ["javascript", "typescript"]:
-            return any(pattern in line for pattern in ['for (', 'for(', 'while (', 'while(', 'forEach('])
-        elif language == "java":
-            return any(pattern in line for pattern in ['for (', 'for(', 'while (', 'while('])
-        elif language in ["cpp", "c"]:
-            return any(pattern in line for pattern in ['for (', 'for(', 'while (', 'while('])
-        elif language == "go":
-            return line.strip().startswith('for ')
-        else:
-            return any(keyword in line.lower() for keyword in ['for', 'while'])
-    
-    def _count_loop_nesting(self, additions: List, current_line: int, language: str) -> int:
-        """Count nesting level of loops"""
-        nesting = 0
-        indent_level = 0
-        
-        # Look backwards from current line to count nesting
-        for line_change in reversed(additions):
-            if line_change.line_number >= current_line:
+    def _scan_file(self, file_change: FileChange) -> Counter:
+        """Scan one file's added lines for performance anti-patterns"""
+        insights = Counter()
+        
+        # Loop structure and stripped text for every added line, computed in one pass
+        loop_starts, loop_depths, lines = self._compute_loop_structure(
+            file_change.additions, file_change.language
+        )
+        
+        # Analyze additions for performance patterns
+        for index, (_, line_content) in enumerate(lines):
+            if not line_content:
                 continue
             
-            line_content = line_change.content
-            current_indent = len(line_content) - len(line_content.lstrip())
+            inside_loop = loop_depths[index] > 0
+            
+            # Check for nested loops
+            if loop_starts[index] and inside_loop:
+                insights["nested_loops"] += 1
+            
+            # Check for database queries in loops
+            if inside_loop and self._contains_database_query(line_content, file_change.language):
+                insights["database_queries_in_loops"] += 1
             
-            if self._is_loop_start(line_content, language):
-                if current_indent < indent_level or indent_level == 0:
-                    nesting += 1
-                    indent_level = current_indent
+            # Check for inefficient data structure usage
+            inefficient_patterns = self._find_inefficient_data_structure_usage(line_content, file_change.language)
+            insights["inefficient_data_structures"] += len(inefficient_patterns)
+            
+            # Check for string concatenation in loops
+            if inside_loop and self._is_string_concatenation(line_content, file_change.language):
+                insights["string_concatenation_in_loops"] += 1
+            
+            # Check for synchronous I/O operations
+            if self._is_synchronous_io(line_content, file_change.language):
+                insights["synchronous_io"] += 1
         
-        return nesting
+        return insights
     
-    def _contains_database_query(self, line: str, language: str) -> bool:
-        """Check if line contains a database query"""
-        db_patterns = [
-            # SQL-like patterns
-            r'\b(SELECT|INSERT|UPDATE|DELETE|CREATE|DROP)\b',
-            # ORM patterns
-            r'\.(find|findOne|findAll|save|create|update|delete|query|execute)\(',
-            r'\.(filter|get|all|first|last)\(',
-            # Database connection patterns
-            r'\.(cursor|execute|fetchone|fetchall|commit)\(',
-            # Framework-specific patterns
-            r'(query|exec|prepare)\(',
-        ]
-        
-        return any(re.search(pattern, line, re.IGNORECASE) for pattern in db_patterns)
+    def _is_loop_start(self, line: str, language: str) -> bool:
+        """Check if a stripped line starts a loop"""
+        loop_start_re = _LOOP_START_RES.get(language)
+        if loop_start_re is None:
+            return _DEFAULT_LOOP_START_RE.search(line) is not None
+        if language in ("python", "go"):
+            # Keyword must start the statement
+            return loop_start_re.match(line) is not None
+        return loop_start_re.search(line) is not None
     
-    def _is_inside_loop(self, additions: List, current_line: int, language: str) -> bool:
-        """Check if current line is inside a loop"""
-        current_indent = None
+    def _compute_loop_structure(
+        self, additions: List, language: str
+    ) -> Tuple[List[bool], List[int], List[Tuple[int, str]]]:
+        """
+        Find loop starts, loop nesting and line shapes for a file's added lines in a single pass
         
-        # Find current line's indentation
-        for line_change in additions:
-            if line_change.line_number == current_line:
-                current_indent = len(line_change.content) - len(line_change.content.lstrip())
-                break
+        Nesting is judged by indentation: a loop encloses the following lines
+        until a non-blank line at the same or lower indentation closes it.
         
-        if current_indent is None:
-            return False
+        Args:
+            additions: Added lines of one file, in line order
+            language: Programming language of the file
+            
+        Returns:
+            Per-line loop-start flags, counts of enclosing loops and
+            (indent, stripped content) pairs
+        """
+        loop_starts = []
+        loop_depths = []
+        lines = []
+        open_loop_indents = []  # Stack of indents of loops enclosing the current line
         
-        # Look backwards for loop starts with less indentation
-        for line_change in reversed(additions):
-            if line_change.line_number >= current_line:
-                continue
+        for line_change in additions:
+            content = line_change.content
+            
+            # Find the first non-whitespace offset once and strip from there
+            if content and content[0].isspace():
+                lstripped = content.lstrip()
+                indent = len(content) - len(lstripped)
+            else:
+                lstripped = content
+                indent = 0
+            stripped = lstripped.rstrip()
+            lines.append((indent, stripped))
+            is_loop = False
+            
+            if stripped:
+                while open_loop_indents and open_loop_indents[-1] >= indent:
+                    open_loop_indents.pop()
+                is_loop = self._is_loop_start(stripped, language)
             
-            line_content = line_change.content
-            line_indent = len(line_content) - len(line_content.lstrip())
+            loop_starts.append(is_loop)
+            loop_depths.append(len(open_loop_indents))
             
-            if line_indent < current_indent and self._is_loop_start(line_content, language):
-                return True
+            if is_loop:
+                open_loop_indents.append(indent)
         
-        return False
+        return loop_starts, loop_depths, lines
     
-    def _identify_query_type(self, line: str) -> str:
-        """Identify the type of database query"""
-        if re.search(r'\b(SELECT|find|get|filter)\b', line, re.IGNORECASE):
-            return "SELECT/READ"
-        elif re.search(r'\b(INSERT|create|save)\b', line, re.IGNORECASE):
-            return "INSERT/CREATE"
-        elif re.search(r'\b(UPDATE|update)\b', line, re.IGNORECASE):
-            return "UPDATE"
-        elif re.search(r'\b(DELETE|delete|remove)\b', line, re.IGNORECASE):
-            return "DELETE"
-        else:
-            return "UNKNOWN"
+    def _contains_database_query(self, line: str, language: str) -> bool:
+        """Check if line contains a database query"""
+        return _DB_QUERY_RE.search(line) is not None
     
     def _find_inefficient_data_structure_usage(self, line: str, language: str) -> List[str]:
         """Find inefficient data structure usage patterns"""
-        patterns = []
-        
-        # Linear search in collections
-        if re.search(r'\bin\s+\w+\s*\[', line) or ' in ' in line:
-            if language == "python" and not re.search(r'\bset\(|\bdict\(', line):
-                patterns.append("linear_search_in_list")
-        
-        # Inefficient list operations
-        if language == "python":
-            if '.insert(0,' in line or '.pop(0)' in line:
-                patterns.append("inefficient_list_operations")
-            if '+=' in line and 'str' in line.lower():
-                patterns.append("string_concatenation")
+        patterns = [
+            name for name, pattern in _DATA_STRUCTURE_RES.get(language, ())
+            if pattern.search(line)
+        ]
         
         # Missing dictionary/map usage for lookups
-        if re.search(r'for\s+\w+\s+in\s+\w+.*if\s+\w+\s*==', line):
+        if _LOOP_WITH_EQUALITY_RE.search(line):
             patterns.append("linear_search_instead_of_dict")
         
         return patterns
     
     def _is_string_concatenation(self, line: str, language: str) -> bool:
         """Check if line contains string concatenation"""
-        if language == "python":
-            return '+=' in line and ('str' in line.lower() or '"' in line or "'" in line)
-        elif language in ["javascript", "typescript"]:
-            return '+=' in line and ('"' in line or "'" in line or '`' in line)
-        elif language == "java":
-            return '+=' in line and ('String' in line or '"' in line)
-        else:
-            return '+=' in line and ('"' in line or "'" in line)
+        if '+=' not in line:
+            return False
+        string_re = _STRING_LITERAL_RES.get(language, _DEFAULT_STRING_LITERAL_RE)
+        return string_re.search(line) is not None
     
     def _is_synchronous_io(self, line: str, language: str) -> bool:
         """Check if line contains synchronous I/O operations"""
-        sync_patterns = [
-            # File operations
-            r'\b(open|read|write|close)\(',
-            # Network requests
-            r'\b(requests\.get|requests\.post|urllib|fetch)\(',
-            # Database operations without async
-            r'\b(execute|query|commit)\(',
-        ]
-        
         # Check if it's not async
         if 'async' in line or 'await' in line:
             return False
         
-        return any(re.search(pattern, line, re.IGNORECASE) for pattern in sync_patterns)
-    
-    def _identify_io_operation(self, line: str) -> str:
-        """Identify the type of I/O operation"""
-        if re.search(r'\b(open|read|write|close)\(', line, re.IGNORECASE):
-            return "FILE_IO"
-        elif re.search(r'\b(requests|fetch|urllib)\b', line, re.IGNORECASE):
-            return "NETWORK_REQUEST"
-        elif re.search(r'\b(execute|query|commit)\(', line, re.IGNORECASE):
-            return "DATABASE_IO"
-        else:
-            return "UNKNOWN_IO"
+        return _SYNC_IO_RE.search(line) is not None
     
-    def _enhance_prompt_with_performance_context(self, messages, context: ReviewContext, performance_insights: Dict):
+    def _enhance_prompt_with_performance_context(self, messages, context: ReviewContext, performance_insights: Counter):
         """Enhance prompt with performance-specific context"""
         # Get the human message (last message)
         human_message = messages[-1]
@@ -395,12 +434,11 @@ Return an empty array [] if no performance issues are found."""
         enhanced_content = f"{human_message.content}\n\n{performance_context}"
         
         # Replace the human message with enhanced version
-        from langchain_core.messages import HumanMessage
         messages[-1] = HumanMessage(content=enhanced_content)
         
         return messages
     
-    def _build_performance_context(self, context: ReviewContext, performance_insights: Dict) -> str:
+    def _build_performance_context(self, context: ReviewContext, performance_insights: Counter) -> str:
         """Build performance-specific analysis context"""
         context_parts = []
         
@@ -425,24 +463,24 @@ Return an empty array [] if no performance issues are found."""
         if any(performance_insights.values()):
             context_parts.append("\n**Pre-Analysis Performance Findings:**")
             
-            if performance_insights["nested_loops"]:
-                count = len(performance_insights["nested_loops"])
+            count = performance_insights["nested_loops"]
+            if count:
                 context_parts.append(f"- Found {count} nested loop patterns (potential O(n²) complexity)")
             
-            if performance_insights["database_queries_in_loops"]:
-                count = len(performance_insights["database_queries_in_loops"])
+            count = performance_insights["database_queries_in_loops"]
+            if count:
                 context_parts.append(f"- Found {count} database queries inside loops (N+1 query pattern)")
             
-            if performance_insights["inefficient_data_structures"]:
-                count = len(performance_insights["inefficient_data_structures"])
+            count = performance_insights["inefficient_data_structures"]
+            if count:
                 context_parts.append(f"- Found {count} inefficient data structure usage patterns")
             
-            if performance_insights["string_concatenation_in_loops"]:
-                count = len(performance_insights["string_concatenation_in_loops"])
+            count = performance_insights["string_concatenation_in_loops"]
+            if count:
                 context_parts.append(f"- Found {count} string concatenation operations in loops")
             
-            if performance_insights["synchronous_io"]:
-                count = len(performance_insights["synchronous_io"])
+            count = performance_insights["synchronous_io"]
+            if count:
                 context_parts.append(f"- Found {count} synchronous I/O operations that could be async")
         
         # Application context
@@ -486,15 +524,11 @@ Return an empty array [] if no performance issues are found."""
     def _validate_performance_findings(self, findings: List[Finding], context: ReviewContext) -> List[Finding]:
         """Validate and filter performance-specific findings"""
         validated = []
+        changed_paths = {f.file_path for f in context.file_changes}
         
         for finding in findings:
             # Ensure finding is in a file that was actually changed
-            file_exists = any(
-                f.file_path == finding.file_path 
-                for f in context.file_changes
-            )
-            
-            if not file_exists:
+            if finding.file_path not in changed_paths:
                 logger.warning(f"Finding references non-existent file: {finding.file_path}")
                 continue
             
@@ -504,13 +538,7 @@ Return an empty array [] if no performance issues are found."""
                 continue
             
             # Validate description mentions performance impact
-            description_lower = finding.description.lower()
-            performance_keywords = [
-                'performance', 'slow', 'inefficient', 'optimization', 'complexity',
-                'memory', 'cpu', 'time', 'speed', 'scalability', 'bottleneck'
-            ]
-            
-            if not any(keyword in description_lower for keyword in performance_keywords):
+            if not _PERFORMANCE_KEYWORDS_RE.search(finding.description.lower()):
                 logger.warning(f"Finding doesn't clearly indicate performance impact: {finding.description}")
                 continue
             
@@ -519,13 +547,7 @@ Return an empty array [] if no performance issues are found."""
                 logger.warning(f"Missing or insufficient optimization suggestion: {finding.suggestion}")
                 continue
             
-            suggestion_lower = finding.suggestion.lower()
-            optimization_keywords = [
-                'optimize', 'improve', 'cache', 'batch', 'async', 'parallel',
-                'index', 'efficient', 'faster', 'reduce', 'avoid'
-            ]
-            
-            if not any(keyword in suggestion_lower for keyword in optimization_keywords):
+            if not _OPTIMIZATION_KEYWORDS_RE.search(finding.suggestion.lower()):
                 logger.warning(f"Suggestion doesn't clearly indicate optimization: {finding.suggestion}")
                 continue
             
@@ -537,50 +559,9 @@ Return an empty array [] if no performance issues are found."""
         
         return validated
     
-    def get_performance_patterns(self) -> Dict[str, List[str]]:
+    def get_performance_patterns(self) -> Mapping[str, Tuple[str, ...]]:
         """Get performance patterns by language"""
-        return {
-            "python": [
-                "List comprehensions over loops",
-                "Sets for membership testing",
-                "Generators for large datasets",
-                "String join() over concatenation",
-                "Dictionary lookups over linear search",
-                "Caching expensive computations"
-            ],
-            "javascript": [
-                "Async/await over callbacks",
-                "Event delegation over individual handlers",
-                "Debouncing/throttling for events",
-                "Virtual DOM optimization",
-                "Lazy loading and code splitting",
-                "Web Workers for heavy computation"
-            ],
-            "java": [
-                "Appropriate collection types",
-                "Parallel streams for large datasets",
-                "Connection pooling",
-                "Avoiding autoboxing overhead",
-                "StringBuilder for string building",
-                "Caching and memoization"
-            ],
-            "cpp": [
-                "Move semantics usage",
-                "Memory access optimization",
-                "SIMD instructions",
-                "Cache-friendly data structures",
-                "Avoiding unnecessary copying",
-                "Template specialization"
-            ],
-            "go": [
-                "Buffered channels",
-                "Goroutine pooling",
-                "Memory pool usage (sync.Pool)",
-                "Efficient JSON parsing",
-                "Avoiding memory allocations",
-                "Profiling-guided optimization"
-            ]
-        }
+        return _PERFORMANCE_PATTERNS
     
     def get_agent_info(self) -> Dict[str, any]:
         """Get information about this agent"""
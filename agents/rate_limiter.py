@@ -0,0 +1,39 @@
+"""
+Token-bucket rate limiting for LLM requests
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Async token bucket that spaces requests to a per-minute quota"""
+
+    def __init__(self, requests_per_minute: int, burst: Optional[int] = None):
+        """
+        Initialize rate limiter
+
+        Args:
+            requests_per_minute: Sustained request rate to allow
+            burst: Requests allowed back to back after idling; defaults to one second's worth
+        """
+        self.requests_per_minute = requests_per_minute
+        self.capacity = burst or max(1, requests_per_minute // 60)
+        self._rate = requests_per_minute / 60.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent, then consume one token"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
@@ -1,17 +1,157 @@
 """
 Readability Analyzer Agent for evaluating code clarity and maintainability
 """
+import ast
 import logging
 import re
-from typing import List, Dict, Set
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Set, Tuple
 
 from langchain_core.language_models import BaseLanguageModel
 
-from agents.base_agent import AnalyzerAgent, AgentConfig
-from models import Finding, ReviewContext, AnalysisCategory
+from agents.base_agent import AnalyzerAgent, AgentConfig, NON_CODE_LANGUAGES
+from agents.regex_engine import compile_pattern
+from models import Finding, FileChange, LineChange, ReviewContext, AnalysisCategory
 
 logger = logging.getLogger(__name__)
 
+_COMMON_NUMBERS = frozenset({'0', '1', '2', '10', '100', '1000'})
+_COMMON_NUMBER_VALUES = frozenset({0, 1, 2, 10, 100, 1000})
+
+# Common poor variable names, all lowercase
+_BAD_NAMES = frozenset({
+    'x', 'y', 'z', 'i', 'j', 'k', 'n', 'm',  # Single letters (except in loops)
+    'data', 'info', 'item', 'obj', 'thing',   # Too generic
+    'temp', 'tmp', 'val', 'var', 'foo', 'bar'  # Temporary/placeholder names
+})
+
+# Language-specific readability guidelines, in the order they appear in the prompt
+_LANG_GUIDELINES = {
+    "python": "- Python: Follow PEP 8, use descriptive names, prefer list comprehensions, add type hints",
+    "javascript": "- JavaScript: Use const/let, descriptive function names, avoid callback hell, use modern ES6+ features",
+    "java": "- Java: Follow camelCase, use meaningful class/method names, avoid deep inheritance",
+    "cpp": "- C/C++: Use clear variable names, avoid macros when possible, consistent formatting",
+    "c": "- C/C++: Use clear variable names, avoid macros when possible, consistent formatting",
+    "go": "- Go: Follow Go conventions, use short but clear names, prefer composition over inheritance",
+}
+
+# Numbers that might be magic (2+ digit decimals and hex literals) and
+# variable assignments/declarations, found together in one scan per line;
+# compiled with RE2 when available since every added line is scanned
+_MAGIC_NUMBER_PATTERN = r'\b(?P<number>\d{2,}|0x[0-9a-fA-F]+)\b'
+_GENERIC_ASSIGNMENT_PATTERN = r'\b(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)\s*='
+_JS_DECLARATION_PATTERN = r'(?:let|const|var)\s+(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)'
+_JAVA_DECLARATION_PATTERN = r'\b[A-Z][a-zA-Z]*\s+(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)\s*='  # Simplified
+_GENERIC_LINE_RE = compile_pattern(f'{_MAGIC_NUMBER_PATTERN}|{_GENERIC_ASSIGNMENT_PATTERN}')
+_JS_LINE_RE = compile_pattern(f'{_MAGIC_NUMBER_PATTERN}|{_JS_DECLARATION_PATTERN}')
+_LINE_PATTERNS = {
+    "python": _GENERIC_LINE_RE,
+    "javascript": _JS_LINE_RE,
+    "typescript": _JS_LINE_RE,
+    "java": compile_pattern(f'{_MAGIC_NUMBER_PATTERN}|{_JAVA_DECLARATION_PATTERN}'),
+}
+
+# Classifies a lowercased file path in one match; alternatives are tried in
+# priority order and the matched group name keys the category
+_FILE_CATEGORY_RE = re.compile(
+    r"^(?:(?=.*(?:test|spec))(?P<test>)"
+    r"|(?=.*(?:config|setting))(?P<config>)"
+    r"|(?=.*(?:util|helper|common))(?P<utility>)"
+    r"|(?=.*(?:model|entity|dto))(?P<model>)"
+    r"|(?=.*(?:service|controller|handler))(?P<logic>)"
+    r"|(?=.*(?:ui|view|component))(?P<ui>))",
+    re.DOTALL
+)
+_FILE_CATEGORIES = {
+    "test": "test",
+    "config": "configuration",
+    "utility": "utility",
+    "model": "data model",
+    "logic": "business logic",
+    "ui": "user interface",
+}
+
+# Pre-analysis only reports counts; past this many instances of a metric the
+# prompt says "N+" and the line scan stops looking for it
+_INSIGHT_CAP = 200
+_LINE_METRICS = ("deep_nesting", "magic_numbers", "poor_names", "long_parameter_lists")
+
+
+def _format_count(count: int) -> str:
+    """Format a pre-analysis count, marking counts that reached the cap"""
+    return f"{_INSIGHT_CAP}+" if count >= _INSIGHT_CAP else str(count)
+
+
+# Readability conventions reviewed per language, shared by every agent instance
+_READABILITY_PATTERNS = MappingProxyType({
+    "python": (
+        "PEP 8 compliance",
+        "Descriptive variable names",
+        "Function length (<50 lines)",
+        "Type hints usage",
+        "List comprehensions over loops",
+        "Docstring presence",
+    ),
+    "javascript": (
+        "Consistent naming (camelCase)",
+        "Modern ES6+ features",
+        "Avoiding callback hell",
+        "Clear function purposes",
+        "Proper error handling",
+        "JSDoc comments",
+    ),
+    "java": (
+        "CamelCase conventions",
+        "Single responsibility principle",
+        "Meaningful class/method names",
+        "Proper encapsulation",
+        "Javadoc documentation",
+        "Avoiding deep inheritance",
+    ),
+    "cpp": (
+        "Consistent naming conventions",
+        "Clear variable names",
+        "Avoiding complex macros",
+        "RAII principles",
+        "Header documentation",
+        "Const correctness",
+    ),
+    "go": (
+        "Go naming conventions",
+        "Short but clear names",
+        "Package organization",
+        "Error handling patterns",
+        "Interface usage",
+        "Go doc comments",
+    ),
+})
+
+
+class _PreAnalysis:
+    """Everything the readability prompt needs from one pass over a batch's file changes"""
+    
+    __slots__ = ('insights', 'languages', 'file_categories', 'total_additions', 'total_deletions')
+    
+    def __init__(self):
+        self.insights = Counter()  # Instances per complexity metric
+        self.languages = set()  # Languages of non-binary files
+        self.file_categories = set()
+        self.total_additions = 0
+        self.total_deletions = 0
+
+
+@lru_cache(maxsize=64)
+def _language_guidelines(languages: frozenset) -> str:
+    """Render the guidelines block for a set of languages; most PRs repeat a few language mixes"""
+    if not languages:
+        return ""
+    
+    # Fixed order and no duplicates keep the text identical across PRs in the same languages
+    guidelines = dict.fromkeys(hint for lang, hint in _LANG_GUIDELINES.items() if lang in languages)
+    return "\n".join(["**Language-Specific Readability Guidelines:**", *guidelines])
+
 
 class ReadabilityAnalyzerAgent(AnalyzerAgent):
     """Analyzer agent specialized in evaluating code readability and maintainability"""
@@ -125,22 +265,8 @@ Return an empty array [] if no readability issues are found."""
             return []
         
         try:
-            # Pre-analyze code for complexity metrics
-            complexity_insights = self._analyze_complexity(context)
-            
-            # Create prompt messages
-            messages = self.create_prompt(context)
-            
-            # Add readability-specific context
-            enhanced_messages = self._enhance_prompt_with_readability_context(
-                messages, context, complexity_insights
-            )
-            
-            # Invoke LLM with retry
-            response = await self._invoke_llm_with_retry(enhanced_messages)
-            
-            # Parse response into findings
-            findings = await self.parse_llm_response(response)
+            # Analyze files in batches sized to fit one LLM call each
+            findings = await self._analyze_in_batches(context, self._analyze_batch)
             
             # Filter and validate findings
             validated_findings = self._validate_readability_findings(findings, context)
@@ -152,125 +278,197 @@ Return an empty array [] if no readability issues are found."""
             logger.error(f"Readability analysis failed: {e}")
             return []
     
-    def _analyze_complexity(self, context: ReviewContext) -> Dict[str, any]:
-        """Pre-analyze code for complexity metrics"""
-        insights = {
-            "long_functions": [],
-            "deep_nesting": [],
-            "long_parameter_lists": [],
-            "magic_numbers": [],
-            "poor_names": []
-        }
+    async def _analyze_batch(self, context: ReviewContext) -> List[Finding]:
+        """Analyze one batch of file changes and return the unvalidated findings"""
+        # Pre-analyze code for complexity metrics and change statistics
+        pre_analysis = self._analyze_complexity(context)
+        
+        # Create prompt messages; language guidelines go after the system
+        # prompt so they share its cacheable prefix, and the readability
+        # context is written into the human message as it is built
+        messages = self.create_prompt(
+            context,
+            extra_human_suffix=self._build_readability_context(pre_analysis),
+            static_guidance=self._build_language_guidelines(pre_analysis.languages)
+        )
+        
+        # Invoke LLM with retry
+        response = await self._invoke_llm_with_retry(messages)
+        
+        # Parse response into findings
+        findings = await self.parse_llm_response(response)
+        
+        return findings
+    
+    def _analyze_complexity(self, context: ReviewContext) -> "_PreAnalysis":
+        """Pre-analyze code for complexity metrics and change statistics in one pass over the files"""
+        pre_analysis = _PreAnalysis()
+        insights = pre_analysis.insights
         
         for file_change in context.file_changes:
+            pre_analysis.total_additions += len(file_change.additions)
+            pre_analysis.total_deletions += len(file_change.deletions)
+            pre_analysis.file_categories.add(self._categorize_file(file_change))
+            
             if file_change.is_binary:
                 continue
             
+            pre_analysis.languages.add(file_change.language)
+            
+            # Complexity heuristics only apply to code
+            if file_change.language in NON_CODE_LANGUAGES:
+                continue
+            
+            # Only counts reach the prompt, so stop scanning once every metric is capped
+            if all(insights[key] >= _INSIGHT_CAP for key in _LINE_METRICS):
+                continue
+            
+            # New Python files are analyzed from their syntax tree in one parse
+            if file_change.language == "python":
+                tree = self._parse_new_python_file(file_change)
+                if tree is not None:
+                    self._collect_python_complexity(tree, insights)
+                    continue
+            
             # Analyze additions for complexity
             for line_change in file_change.additions:
                 line_content = line_change.content.strip()
                 
                 # Check for deep nesting (count leading whitespace)
-                if line_content:
-                    indent_level = self._count_indent_level(line_change.content, file_change.language)
+                if line_content and insights["deep_nesting"] < _INSIGHT_CAP:
+                    indent_level = self._count_indent_level(line_change, file_change.language)
                     if indent_level > 4:
-                        insights["deep_nesting"].append({
-                            "file": file_change.file_path,
-                            "line": line_change.line_number,
-                            "level": indent_level
-                        })
+                        insights["deep_nesting"] += 1
                 
-                # Check for magic numbers
-                magic_numbers = self._find_magic_numbers(line_content, file_change.language)
-                for number in magic_numbers:
-                    insights["magic_numbers"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number,
-                        "number": number
-                    })
-                
-                # Check for poor variable names
-                poor_names = self._find_poor_names(line_content, file_change.language)
-                for name in poor_names:
-                    insights["poor_names"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number,
-                        "name": name
-                    })
+                # Check for magic numbers and poor variable names
+                if insights["magic_numbers"] < _INSIGHT_CAP or insights["poor_names"] < _INSIGHT_CAP:
+                    magic_numbers, poor_names = self._find_magic_numbers_and_poor_names(
+                        line_content, file_change.language
+                    )
+                    insights["magic_numbers"] += len(magic_numbers)
+                    insights["poor_names"] += len(poor_names)
                 
                 # Check for long parameter lists
-                if self._is_function_definition(line_content, file_change.language):
+                if (
+                    insights["long_parameter_lists"] < _INSIGHT_CAP
+                    and self._is_function_definition(line_content, file_change.language)
+                ):
                     param_count = self._count_parameters(line_content, file_change.language)
                     if param_count > 5:
-                        insights["long_parameter_lists"].append({
-                            "file": file_change.file_path,
-                            "line": line_change.line_number,
-                            "count": param_count
-                        })
+                        insights["long_parameter_lists"] += 1
+        
+        return pre_analysis
+    
+    def _parse_new_python_file(self, file_change: FileChange) -> Optional[ast.Module]:
+        """
+        Parse a Python file whose diff holds its entire contents
+        
+        Only new files can be rebuilt from the diff; partial hunks rarely
+        parse on their own and their nesting would be wrong.
+        
+        Args:
+            file_change: Changes to one Python file
+            
+        Returns:
+            Syntax tree, or None if the file isn't wholly added or doesn't parse
+        """
+        additions = file_change.additions
+        if not additions or file_change.deletions or file_change.modifications:
+            return None
+        
+        if any(line_change.line_number != number for number, line_change in enumerate(additions, 1)):
+            return None
+        
+        try:
+            return ast.parse("\n".join(line_change.content for line_change in additions))
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            # Deeply nested or huge sources can exhaust the parser
+            return None
+    
+    def _collect_python_complexity(self, tree: ast.Module, insights: Counter):
+        """Record the same complexity metrics as the line scan from a Python syntax tree"""
+        nested_lines = set()
+        loop_targets = set()
         
-        return insights
+        # ast.walk visits a loop before its target names
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.For, ast.AsyncFor, ast.comprehension)):
+                loop_targets.update(id(name) for name in ast.walk(node.target))
+            
+            if isinstance(node, ast.stmt):
+                # Check for deep nesting, once per line
+                indent_level = node.col_offset // 4
+                if indent_level > 4 and node.lineno not in nested_lines:
+                    nested_lines.add(node.lineno)
+                    insights["deep_nesting"] += 1
+                
+                # Check for long parameter lists
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    args = node.args
+                    param_count = (
+                        len(args.posonlyargs) + len(args.args) + len(args.kwonlyargs)
+                        + (args.vararg is not None) + (args.kwarg is not None)
+                    )
+                    if param_count > 5:
+                        insights["long_parameter_lists"] += 1
+            
+            # Check for magic numbers; comments and strings never reach the tree
+            elif isinstance(node, ast.Constant):
+                value = node.value
+                if (
+                    type(value) in (int, float)
+                    and abs(value) >= 10
+                    and value not in _COMMON_NUMBER_VALUES
+                ):
+                    insights["magic_numbers"] += 1
+            
+            # Check for poor variable names among assigned names
+            elif (
+                isinstance(node, ast.Name)
+                and isinstance(node.ctx, ast.Store)
+                and id(node) not in loop_targets
+                and (node.id in _BAD_NAMES or node.id.lower() in _BAD_NAMES)
+            ):
+                insights["poor_names"] += 1
     
-    def _count_indent_level(self, line: str, language: str) -> int:
+    def _count_indent_level(self, line_change: LineChange, language: str) -> int:
         """Count indentation level of a line"""
+        content = line_change.content
+        if not content or not content[0].isspace():
+            return 0
+        
+        indent = len(content) - len(content.lstrip())
         if language == "python":
             # Python uses spaces for indentation
-            return (len(line) - len(line.lstrip())) // 4
+            return indent // 4
         else:
             # Most other languages use braces, count leading whitespace
-            return len(line) - len(line.lstrip())
+            return indent
     
-    def _find_magic_numbers(self, line: str, language: str) -> List[str]:
-        """Find magic numbers in a line of code"""
+    def _find_magic_numbers_and_poor_names(self, line: str, language: str) -> Tuple[List[str], List[str]]:
+        """Find magic numbers and poorly named variables in a line of code"""
         magic_numbers = []
-        
-        # Common patterns for numbers that might be magic
-        number_patterns = [
-            r'\b(\d{2,})\b',  # Numbers with 2+ digits
-            r'\b(0x[0-9a-fA-F]+)\b',  # Hex numbers
-        ]
-        
-        for pattern in number_patterns:
-            matches = re.findall(pattern, line)
-            for match in matches:
-                # Skip common non-magic numbers
-                if match not in ['0', '1', '2', '10', '100', '1000']:
-                    # Skip if it looks like it's in a comment
-                    if '//' not in line[:line.find(match)] and '#' not in line[:line.find(match)]:
-                        magic_numbers.append(match)
-        
-        return magic_numbers
-    
-    def _find_poor_names(self, line: str, language: str) -> List[str]:
-        """Find poorly named variables in a line of code"""
         poor_names = []
         
-        # Common poor variable names
-        bad_names = {
-            'x', 'y', 'z', 'i', 'j', 'k', 'n', 'm',  # Single letters (except in loops)
-            'data', 'info', 'item', 'obj', 'thing',   # Too generic
-            'temp', 'tmp', 'val', 'var', 'foo', 'bar' # Temporary/placeholder names
-        }
-        
-        # Simple pattern to find variable assignments
-        if language == "python":
-            # Python variable assignment
-            var_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\s*='
-        elif language in ["javascript", "typescript"]:
-            # JavaScript variable declaration
-            var_pattern = r'(?:let|const|var)\s+([a-zA-Z_][a-zA-Z0-9_]*)'
-        elif language == "java":
-            # Java variable declaration (simplified)
-            var_pattern = r'\b[A-Z][a-zA-Z]*\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*='
-        else:
-            # Generic pattern
-            var_pattern = r'\b([a-zA-Z_][a-zA-Z0-9_]*)\s*='
+        # Numbers after a comment marker are in the comment
+        comment_start = min(
+            (index for index in (line.find('//'), line.find('#')) if index != -1),
+            default=len(line)
+        )
         
-        matches = re.findall(var_pattern, line)
-        for match in matches:
-            if match.lower() in bad_names:
-                poor_names.append(match)
+        for match in _LINE_PATTERNS.get(language, _GENERIC_LINE_RE).finditer(line):
+            if match.lastgroup == "number":
+                number = match.group("number")
+                # Skip common non-magic numbers and numbers in comments
+                if number not in _COMMON_NUMBERS and match.start() < comment_start:
+                    magic_numbers.append(number)
+            else:
+                name = match.group("name")
+                # Identifiers are usually lowercase already; only lowercase on a miss
+                if name in _BAD_NAMES or name.lower() in _BAD_NAMES:
+                    poor_names.append(name)
         
-        return poor_names
+        return magic_numbers, poor_names
     
     def _is_function_definition(self, line: str, language: str) -> bool:
         """Check if line contains a function definition"""
@@ -303,71 +501,43 @@ Return an empty array [] if no readability issues are found."""
         except:
             return 0
     
-    def _enhance_prompt_with_readability_context(self, messages, context: ReviewContext, complexity_insights: Dict):
-        """Enhance prompt with readability-specific context"""
-        # Get the human message (last message)
-        human_message = messages[-1]
-        
-        # Add readability-specific instructions
-        readability_context = self._build_readability_context(context, complexity_insights)
-        
-        enhanced_content = f"{human_message.content}\n\n{readability_context}"
-        
-        # Replace the human message with enhanced version
-        from langchain_core.messages import HumanMessage
-        messages[-1] = HumanMessage(content=enhanced_content)
-        
-        return messages
+    def _build_language_guidelines(self, languages: Set[str]) -> str:
+        """Build the language-specific readability guidelines for the changed files"""
+        return _language_guidelines(frozenset(languages))
     
-    def _build_readability_context(self, context: ReviewContext, complexity_insights: Dict) -> str:
+    def _build_readability_context(self, pre_analysis: "_PreAnalysis") -> str:
         """Build readability-specific analysis context"""
         context_parts = []
-        
-        # Language-specific readability guidelines
-        languages = set(f.language for f in context.file_changes if not f.is_binary)
-        if languages:
-            context_parts.append("**Language-Specific Readability Guidelines:**")
-            
-            for lang in languages:
-                if lang == "python":
-                    context_parts.append("- Python: Follow PEP 8, use descriptive names, prefer list comprehensions, add type hints")
-                elif lang == "javascript":
-                    context_parts.append("- JavaScript: Use const/let, descriptive function names, avoid callback hell, use modern ES6+ features")
-                elif lang == "java":
-                    context_parts.append("- Java: Follow camelCase, use meaningful class/method names, avoid deep inheritance")
-                elif lang == "cpp" or lang == "c":
-                    context_parts.append("- C/C++: Use clear variable names, avoid macros when possible, consistent formatting")
-                elif lang == "go":
-                    context_parts.append("- Go: Follow Go conventions, use short but clear names, prefer composition over inheritance")
+        complexity_insights = pre_analysis.insights
         
         # Complexity insights
         if any(complexity_insights.values()):
-            context_parts.append("\n**Pre-Analysis Findings:**")
+            context_parts.append("**Pre-Analysis Findings:**")
             
-            if complexity_insights["deep_nesting"]:
-                count = len(complexity_insights["deep_nesting"])
-                context_parts.append(f"- Found {count} instances of deep nesting (>4 levels)")
+            count = complexity_insights["deep_nesting"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} instances of deep nesting (>4 levels)")
             
-            if complexity_insights["magic_numbers"]:
-                count = len(complexity_insights["magic_numbers"])
-                context_parts.append(f"- Found {count} potential magic numbers")
+            count = complexity_insights["magic_numbers"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} potential magic numbers")
             
-            if complexity_insights["poor_names"]:
-                count = len(complexity_insights["poor_names"])
-                context_parts.append(f"- Found {count} potentially poor variable names")
+            count = complexity_insights["poor_names"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} potentially poor variable names")
             
-            if complexity_insights["long_parameter_lists"]:
-                count = len(complexity_insights["long_parameter_lists"])
-                context_parts.append(f"- Found {count} functions with >5 parameters")
+            count = complexity_insights["long_parameter_lists"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} functions with >5 parameters")
         
         # File context
-        file_types = self._categorize_files(context.file_changes)
+        file_types = pre_analysis.file_categories
         if file_types:
-            context_parts.append(f"\n**File Types**: {', '.join(file_types)} - adjust readability standards accordingly")
+            context_parts.append(f"\n**File Types**: {', '.join(sorted(file_types))} - adjust readability standards accordingly")
         
         # Change context
-        total_additions = sum(len(f.additions) for f in context.file_changes)
-        total_deletions = sum(len(f.deletions) for f in context.file_changes)
+        total_additions = pre_analysis.total_additions
+        total_deletions = pre_analysis.total_deletions
         
         if total_additions > total_deletions * 2:
             context_parts.append("\n**Focus**: Primarily new code - emphasize establishing good patterns")
@@ -378,42 +548,19 @@ Return an empty array [] if no readability issues are found."""
         
         return "\n".join(context_parts)
     
-    def _categorize_files(self, file_changes) -> Set[str]:
-        """Categorize files by type for context"""
-        categories = set()
-        
-        for file_change in file_changes:
-            path = file_change.file_path.lower()
-            
-            if any(keyword in path for keyword in ['test', 'spec']):
-                categories.add("test")
-            elif any(keyword in path for keyword in ['config', 'setting']):
-                categories.add("configuration")
-            elif any(keyword in path for keyword in ['util', 'helper', 'common']):
-                categories.add("utility")
-            elif any(keyword in path for keyword in ['model', 'entity', 'dto']):
-                categories.add("data model")
-            elif any(keyword in path for keyword in ['service', 'controller', 'handler']):
-                categories.add("business logic")
-            elif any(keyword in path for keyword in ['ui', 'view', 'component']):
-                categories.add("user interface")
-            else:
-                categories.add("application")
-        
-        return categories
+    def _categorize_file(self, file_change: FileChange) -> str:
+        """Categorize a file by type for context"""
+        match = _FILE_CATEGORY_RE.match(file_change.file_path.lower())
+        return _FILE_CATEGORIES[match.lastgroup] if match else "application"
     
     def _validate_readability_findings(self, findings: List[Finding], context: ReviewContext) -> List[Finding]:
         """Validate and filter readability-specific findings"""
         validated = []
+        changed_paths = {f.file_path for f in context.file_changes}
         
         for finding in findings:
             # Ensure finding is in a file that was actually changed
-            file_exists = any(
-                f.file_path == finding.file_path 
-                for f in context.file_changes
-            )
-            
-            if not file_exists:
+            if finding.file_path not in changed_paths:
                 logger.warning(f"Finding references non-existent file: {finding.file_path}")
                 continue
             
@@ -440,50 +587,9 @@ Return an empty array [] if no readability issues are found."""
         
         return validated
     
-    def get_readability_patterns(self) -> Dict[str, List[str]]:
+    def get_readability_patterns(self) -> Mapping[str, Tuple[str, ...]]:
         """Get readability patterns by language"""
-        return {
-            "python": [
-                "PEP 8 compliance",
-                "Descriptive variable names",
-                "Function length (<50 lines)",
-                "Type hints usage",
-                "List comprehensions over loops",
-                "Docstring presence"
-            ],
-            "javascript": [
-                "Consistent naming (camelCase)",
-                "Modern ES6+ features",
-                "Avoiding callback hell",
-                "Clear function purposes",
-                "Proper error handling",
-                "JSDoc comments"
-            ],
-            "java": [
-                "CamelCase conventions",
-                "Single responsibility principle",
-                "Meaningful class/method names",
-                "Proper encapsulation",
-                "Javadoc documentation",
-                "Avoiding deep inheritance"
-            ],
-            "cpp": [
-                "Consistent naming conventions",
-                "Clear variable names",
-                "Avoiding complex macros",
-                "RAII principles",
-                "Header documentation",
-                "Const correctness"
-            ],
-            "go": [
-                "Go naming conventions",
-                "Short but clear names",
-                "Package organization",
-                "Error handling patterns",
-                "Interface usage",
-                "Go doc comments"
-            ]
-        }
+        return _READABILITY_PATTERNS
     
     def get_agent_info(self) -> Dict[str, any]:
         """Get information about this agent"""
@@ -0,0 +1,50 @@
+"""
+Regex compilation for the analyzers' pre-analysis scanners
+"""
+import logging
+import re
+from typing import Any
+
+try:
+    import re2
+except ImportError:  # google-re2 is an optional speedup; fall back to the stdlib
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+# Name of the engine used for patterns RE2 can handle
+REGEX_ENGINE = "re2" if re2 is not None else "re"
+
+# Flags RE2 accepts as inline modifiers
+_INLINE_FLAGS = {
+    re.IGNORECASE: "i",
+    re.MULTILINE: "m",
+    re.DOTALL: "s",
+}
+
+
+def compile_pattern(pattern: str, flags: int = 0) -> Any:
+    """
+    Compile a pattern with RE2 when it is installed, otherwise with re
+
+    RE2 matches in linear time, which matters when scanning untrusted diff
+    text. Patterns it can't handle (lookarounds, backreferences) or flags
+    it has no inline form for are compiled with re instead.
+
+    Args:
+        pattern: Regular expression
+        flags: re module flags
+
+    Returns:
+        Compiled pattern exposing search/match/fullmatch
+    """
+    if re2 is not None:
+        inline = "".join(letter for flag, letter in _INLINE_FLAGS.items() if flags & flag)
+        unsupported = flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL)
+        if not unsupported:
+            try:
+                return re2.compile(f"(?{inline}){pattern}" if inline else pattern)
+            except Exception as e:
+                logger.debug(f"RE2 can't compile pattern, using re: {e}")
+
+    return re.compile(pattern, flags)
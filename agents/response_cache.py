@@ -0,0 +1,170 @@
+"""
+Content-addressed caches for LLM responses and parsed findings
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """In-memory LRU cache with expiry, keyed on a content hash"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0):
+        """
+        Initialize response cache
+
+        Args:
+            max_entries: Maximum number of cached responses
+            ttl: Seconds a cached response stays valid
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        messages: List[BaseMessage],
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        prompt_version: int = 0
+    ) -> str:
+        """
+        Build a cache key from everything that determines the LLM output
+
+        Args:
+            messages: Messages sent to the LLM
+            model: Model identifier
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            prompt_version: Version of the prompt format; bumping it retires old entries
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            [[message.type, message.content] for message in messages],
+            sort_keys=True
+        )
+        digest = hashlib.blake2b(payload.encode(), digest_size=32)
+        digest.update(f"|{model}|{temperature}|{max_tokens}|{prompt_version}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def set(self, key: str, response: Any):
+        """Store a value, evicting the least recently used entries"""
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached values"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+class _Flight:
+    """One shared call and the number of callers awaiting it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight call"""
+
+    def __init__(self):
+        """Initialize with no calls in flight"""
+        self._calls: Dict[str, _Flight] = {}
+        self.coalesced = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await the in-flight call for a key, or start one with factory
+
+        The call runs in its own task, so a caller that is cancelled stops
+        waiting without aborting the call for the others. The call itself is
+        cancelled once no caller is waiting for it.
+
+        Args:
+            key: Content hash identifying the call
+            factory: Starts the call when none is in flight
+
+        Returns:
+            Result of the shared call
+        """
+        loop = asyncio.get_running_loop()
+        flight = self._calls.get(key)
+        if flight is not None and flight.task.get_loop() is loop:
+            self.coalesced += 1
+        else:
+            flight = _Flight(loop.create_task(factory()))
+            self._calls[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+
+    def _finish(self, key: str, flight: _Flight):
+        """Forget a finished call; a newer call for the key may have replaced it"""
+        if self._calls.get(key) is flight:
+            del self._calls[key]
+
+        # Mark the error retrieved when every caller stopped waiting first
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+
+# Shared by all agents so re-reviews of the same PR revision skip the LLM
+default_response_cache = ResponseCache()
+
+# Parsed findings per file batch; survives PR title and batch-order changes
+# that alter the rendered request, so it is kept for a week
+default_findings_cache = ResponseCache(ttl=7 * 24 * 3600.0)
+
+# Identical LLM requests issued concurrently, e.g. duplicate review triggers
+# for the same PR revision, share one call
+default_single_flight = SingleFlight()
@@ -1,17 +1,175 @@
 """
 Security Analyzer Agent for detecting security vulnerabilities
 """
+import asyncio
 import logging
 import re
-from typing import List, Dict, Set
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Set, Tuple
 
 from langchain_core.language_models import BaseLanguageModel
 
 from agents.base_agent import AnalyzerAgent, AgentConfig
+from agents.regex_engine import compile_pattern
 from models import Finding, ReviewContext, AnalysisCategory
 
 logger = logging.getLogger(__name__)
 
+# Each yes/no check is one alternation so a line is scanned once per category
+# instead of once per pattern
+_XSS_RE = compile_pattern("|".join([
+    r'\.innerHTML\s*=',
+    r'dangerouslySetInnerHTML',
+    r'document\.write\(',
+    r'\.html\(',  # jQuery
+    r'v-html=',  # Vue.js
+    r'\[innerHTML\]',  # Angular
+]), re.IGNORECASE)
+
+# Common secret patterns; each is checked on its own since one line can hold
+# several kinds of secret
+_SECRET_PATTERNS = {
+    secret_type: compile_pattern(pattern, re.IGNORECASE)
+    for secret_type, pattern in {
+        'password': r'password\s*=\s*["\'][^"\']{3,}["\']',
+        'api_key': r'api[_-]?key\s*=\s*["\'][^"\']{10,}["\']',
+        'secret': r'secret\s*=\s*["\'][^"\']{10,}["\']',
+        'token': r'token\s*=\s*["\'][^"\']{10,}["\']',
+        'private_key': r'private[_-]?key\s*=\s*["\'][^"\']{10,}["\']',
+        'aws_key': r'aws[_-]?(access[_-]?)?key[_-]?id\s*=\s*["\'][^"\']{10,}["\']',
+    }.items()
+}
+
+# Test/placeholder values that mark a secret-looking line as not a real secret
+_PLACEHOLDER_RE = compile_pattern("|".join([
+    'your_', 'example', 'test', 'dummy', 'fake', 'placeholder', 'xxx'
+]))
+
+_WEAK_CRYPTO_RE = compile_pattern("|".join([
+    r'\bMD5\b',
+    r'\bSHA1\b',
+    r'\bDES\b',
+    r'\bRC4\b',
+    r'\.md5\(',
+    r'\.sha1\(',
+    r'hashlib\.md5',
+    r'hashlib\.sha1',
+    r'crypto\.createHash\(["\']md5',
+    r'crypto\.createHash\(["\']sha1',
+]), re.IGNORECASE)
+
+_LOGGING_RE = compile_pattern("|".join([
+    r'log\.',
+    r'logger\.',
+    r'console\.',
+    r'print\(',
+    r'println\(',
+    r'System\.out',
+]), re.IGNORECASE)
+
+# Sensitive data keywords, matched against the lowercased line in one pass
+_SENSITIVE_KEYWORD_RE = compile_pattern("|".join(re.escape(keyword) for keyword in [
+    'password', 'passwd', 'pwd',
+    'token', 'secret', 'key',
+    'credit_card', 'creditcard', 'ssn',
+    'api_key', 'apikey',
+    'private_key', 'privatekey',
+    'authorization', 'auth',
+]))
+
+_EXECUTE_RE = compile_pattern(r'\.execute\s*\(\s*["\'].*[+%]')
+
+# Lockfiles, minified bundles, generated code and vendored dependencies; their
+# additions aren't authored in the PR, so the pre-analysis skips them
+_GENERATED_PATH_RE = compile_pattern(
+    r'(?:\.lock|package-lock\.json|go\.sum|\.min\.js|\.min\.css|\.map|\.pb\.go|_pb2\.py)$'
+    r'|(?:^|/)(?:vendor|node_modules|dist|generated)/'
+)
+
+# Per-category match count past which the pre-analysis stops scanning; the
+# counts only feed a prompt hint, so larger numbers add nothing
+_INSIGHT_CAP = 200
+_INSIGHT_KEYS = (
+    "sql_injection_risks", "xss_risks", "hardcoded_secrets",
+    "weak_crypto", "sensitive_data_exposure", "insecure_deserialization",
+)
+
+_SQL_KEYWORD_RE = compile_pattern('select|insert|update|delete|from|where')
+
+_JS_SQL_CONCAT = (' + ', '${', '`')
+_JS_DESERIALIZATION = ('eval(', 'Function(')
+
+# Language-specific markers, looked up once per file rather than per line
+_SQL_CONCAT_MARKERS = {
+    "python": (' + ', '.format(', 'f"', "f'"),
+    "javascript": _JS_SQL_CONCAT,
+    "typescript": _JS_SQL_CONCAT,
+    "java": (' + ', '.concat('),
+}
+
+_DESERIALIZATION_MARKERS = {
+    "python": ('pickle.loads', 'yaml.load('),
+    "javascript": _JS_DESERIALIZATION,
+    "typescript": _JS_DESERIALIZATION,
+    "java": ('readObject()', 'XMLDecoder'),
+}
+
+
+# Classifies a lowercased file path in one match; alternatives are tried in
+# priority order and the matched group name is the security context
+_SECURITY_CONTEXT_RE = re.compile(
+    r"^(?:(?=.*(?:auth|login|session))(?P<auth>)"
+    r"|(?=.*(?:api|controller|endpoint))(?P<api>)"
+    r"|(?=.*(?:database|db|sql|query))(?P<database>)"
+    r"|(?=.*(?:crypto|encrypt|hash))(?P<crypto>)"
+    r"|(?=.*(?:user|input|form))(?P<user_input>)"
+    r"|(?=.*(?:config|setting))(?P<config>)"
+    r"|(?=.*(?:payment|billing))(?P<payment>))",
+    re.DOTALL
+)
+
+_SECURITY_CONTEXTS = {
+    "auth": "Authentication/Authorization",
+    "api": "API endpoints",
+    "database": "Database layer",
+    "crypto": "Cryptography",
+    "user_input": "User input handling",
+    "config": "Configuration",
+    "payment": "Payment processing",
+}
+
+_C_GUIDELINE = "- C/C++: Check for buffer overflows, format string vulnerabilities, use-after-free, integer overflows"
+
+# Security guidance per language, in the order it appears in the prompt
+_LANG_GUIDELINES = {
+    "python": "- Python: Watch for pickle deserialization, SQL injection in raw queries, command injection in subprocess, YAML unsafe loading",
+    "javascript": "- JavaScript: Check for XSS via innerHTML, eval() usage, prototype pollution, insecure dependencies",
+    "java": "- Java: Look for SQL injection, XXE vulnerabilities, insecure deserialization, path traversal",
+    "cpp": _C_GUIDELINE,
+    "c": _C_GUIDELINE,
+    "go": "- Go: Watch for SQL injection, command injection, path traversal, insecure TLS configuration",
+}
+
+_OWASP_REMINDER = "**OWASP Top 10 Focus Areas**: Injection, Broken Authentication, Sensitive Data Exposure, XXE, Broken Access Control, Security Misconfiguration, XSS, Insecure Deserialization, Using Components with Known Vulnerabilities, Insufficient Logging & Monitoring"
+
+
+@lru_cache(maxsize=64)
+def _security_guidelines(languages: frozenset) -> str:
+    """Render the language guidelines and OWASP reminder; most PRs repeat a few language mixes"""
+    parts = []
+    if languages:
+        # Fixed order and no duplicates keep the text identical across PRs in the same languages
+        guidelines = dict.fromkeys(hint for lang, hint in _LANG_GUIDELINES.items() if lang in languages)
+        parts.append("\n".join(["**Language-Specific Security Guidelines:**", *guidelines]))
+    parts.append(_OWASP_REMINDER)
+    return "\n\n".join(parts)
+
+
+def _format_count(count: int) -> str:
+    """Format a pre-analysis count, marking counts that reached the cap"""
+    return f"{_INSIGHT_CAP}+" if count >= _INSIGHT_CAP else str(count)
+
 
 class SecurityAnalyzerAgent(AnalyzerAgent):
     """Analyzer agent specialized in detecting security vulnerabilities"""
@@ -163,22 +321,8 @@ Return an empty array [] if no security vulnerabilities are found."""
             return []
 
         try:
-            # Pre-analyze code for security patterns
-            security_insights = self._analyze_security_patterns(context)
-
-            # Create prompt messages
-            messages = self.create_prompt(context)
-
-            # Add security-specific context
-            enhanced_messages = self._enhance_prompt_with_security_context(
-                messages, context, security_insights
-            )
-
-            # Invoke LLM with retry
-            response = await self._invoke_llm_with_retry(enhanced_messages)
-
-            # Parse response into findings
-            findings = await self.parse_llm_response(response)
+            # Analyze files in batches sized to fit one LLM call each
+            findings = await self._analyze_in_batches(context, self._analyze_batch)
 
             # Filter and validate findings
             validated_findings = self._validate_security_findings(findings, context)
@@ -190,23 +334,48 @@ Return an empty array [] if no security vulnerabilities are found."""
             logger.error(f"Security analysis failed: {e}")
             return []
 
-    def _analyze_security_patterns(self, context: ReviewContext) -> Dict[str, any]:
-        """Pre-analyze code for security anti-patterns"""
-        insights = {
-            "sql_injection_risks": [],
-            "xss_risks": [],
-            "hardcoded_secrets": [],
-            "weak_crypto": [],
-            "input_validation_missing": [],
-            "sensitive_data_exposure": [],
-            "authentication_issues": [],
-            "insecure_deserialization": []
-        }
+    async def _analyze_batch(self, context: ReviewContext) -> List[Finding]:
+        """Analyze one batch of file changes and return the unvalidated findings"""
+        # Pre-analyze code for security patterns off the event loop so
+        # other agents' LLM calls keep making progress during the scan
+        security_insights = await asyncio.to_thread(self._analyze_security_patterns, context)
+
+        # Create prompt messages; the language guidelines and OWASP reminder
+        # go after the system prompt so they share its cacheable prefix, and
+        # the PR-specific security context is written into the human message
+        messages = self.create_prompt(
+            context,
+            extra_human_suffix=self._build_security_context(context, security_insights),
+            static_guidance=self._build_security_guidelines(context)
+        )
+
+        # Invoke LLM with retry
+        response = await self._invoke_llm_with_retry(messages)
+
+        # Parse response into findings
+        findings = await self.parse_llm_response(response)
+
+        return findings
+
+    def _analyze_security_patterns(self, context: ReviewContext) -> Counter:
+        """Pre-analyze code for security anti-patterns, counting matches per category"""
+        insights = Counter()
+        # Categories matched by each distinct (language, line) in this context
+        line_scans: Dict[Tuple[str, str], Tuple[str, ...]] = {}
 
         for file_change in context.file_changes:
-            if file_change.is_binary:
+            if file_change.is_binary or _GENERATED_PATH_RE.search(file_change.file_path.lower()):
                 continue
 
+            # Stop once every category has reached the cap
+            if all(insights[key] >= _INSIGHT_CAP for key in _INSIGHT_KEYS):
+                break
+
+            # Per-file values are read once instead of on every added line
+            language = file_change.language
+            sql_concat_markers = _SQL_CONCAT_MARKERS.get(language, ())
+            deserialization_markers = _DESERIALIZATION_MARKERS.get(language, ())
+
             # Analyze additions for security patterns
             for line_change in file_change.additions:
                 line_content = line_change.content.strip()
@@ -214,247 +383,148 @@ Return an empty array [] if no security vulnerabilities are found."""
                 if not line_content:
                     continue
 
-                # Check for SQL injection risks
-                if self._has_sql_injection_risk(line_content, file_change.language):
-                    insights["sql_injection_risks"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number,
-                        "pattern": "string_concatenation_in_query"
-                    })
-
-                # Check for XSS risks
-                if self._has_xss_risk(line_content, file_change.language):
-                    insights["xss_risks"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number,
-                        "pattern": "unsafe_html_rendering"
-                    })
-
-                # Check for hardcoded secrets
-                secrets = self._find_hardcoded_secrets(line_content)
-                for secret_type in secrets:
-                    insights["hardcoded_secrets"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number,
-                        "type": secret_type
-                    })
-
-                # Check for weak cryptography
-                if self._has_weak_crypto(line_content, file_change.language):
-                    insights["weak_crypto"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number
-                    })
-
-                # Check for sensitive data in logs
-                if self._logs_sensitive_data(line_content, file_change.language):
-                    insights["sensitive_data_exposure"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number,
-                        "type": "logging"
-                    })
-
-                # Check for insecure deserialization
-                if self._has_insecure_deserialization(line_content, file_change.language):
-                    insights["insecure_deserialization"].append({
-                        "file": file_change.file_path,
-                        "line": line_change.line_number
-                    })
+                # Repeated lines (boilerplate, generated code) are scanned once
+                scan_key = (language, line_content)
+                matches = line_scans.get(scan_key)
+                if matches is None:
+                    matches = line_scans[scan_key] = self._scan_line(
+                        line_content, language, sql_concat_markers, deserialization_markers
+                    )
+
+                for category in matches:
+                    if insights[category] < _INSIGHT_CAP:
+                        insights[category] += 1
 
         return insights
 
-    def _has_sql_injection_risk(self, line: str, language: str) -> bool:
+    def _scan_line(
+        self,
+        line: str,
+        language: str,
+        sql_concat_markers: Tuple[str, ...],
+        deserialization_markers: Tuple[str, ...]
+    ) -> Tuple[str, ...]:
+        """Run every security check on one added line and return the insight category of each match"""
+        matches = []
+
+        # Lowercase once for the case-insensitive keyword checks
+        line_lower = line.lower()
+
+        # Check for SQL injection risks
+        if self._has_sql_injection_risk(line, line_lower, sql_concat_markers):
+            matches.append("sql_injection_risks")
+
+        # Check for XSS risks
+        if self._has_xss_risk(line, language):
+            matches.append("xss_risks")
+
+        # Check for hardcoded secrets
+        matches.extend("hardcoded_secrets" for _ in self._find_hardcoded_secrets(line, line_lower))
+
+        # Check for weak cryptography
+        if self._has_weak_crypto(line, language):
+            matches.append("weak_crypto")
+
+        # Check for sensitive data in logs
+        if self._logs_sensitive_data(line, line_lower, language):
+            matches.append("sensitive_data_exposure")
+
+        # Check for insecure deserialization
+        if self._has_insecure_deserialization(line, deserialization_markers):
+            matches.append("insecure_deserialization")
+
+        return tuple(matches)
+
+    def _has_sql_injection_risk(self, line: str, line_lower: str, concat_markers: Tuple[str, ...]) -> bool:
         """Check if line has SQL injection risk"""
-        # String concatenation with SQL keywords
-        sql_keywords = ['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'FROM', 'WHERE']
-
-        # Check for string concatenation with SQL
-        if any(keyword in line.upper() for keyword in sql_keywords):
-            # Look for string concatenation patterns
-            if language == "python":
-                if any(pattern in line for pattern in [' + ', '.format(', 'f"', "f'"]):
-                    return True
-            elif language in ["javascript", "typescript"]:
-                if any(pattern in line for pattern in [' + ', '${', '`']):
-                    return True
-            elif language == "java":
-                if ' + ' in line or '.concat(' in line:
-                    return True
+        # Check for string concatenation with SQL keywords; most lines have
+        # neither, so the cheaper concatenation test runs first
+        if any(pattern in line for pattern in concat_markers):
+            if _SQL_KEYWORD_RE.search(line_lower):
+                return True
 
         # Check for execute with string formatting
-        if re.search(r'\.execute\s*\(\s*["\'].*[+%]', line):
+        if '.execute' in line and _EXECUTE_RE.search(line):
             return True
 
         return False
 
     def _has_xss_risk(self, line: str, language: str) -> bool:
         """Check if line has XSS risk"""
-        xss_patterns = [
-            r'\.innerHTML\s*=',
-            r'dangerouslySetInnerHTML',
-            r'document\.write\(',
-            r'\.html\(',  # jQuery
-            r'v-html=',  # Vue.js
-            r'\[innerHTML\]',  # Angular
-        ]
+        return _XSS_RE.search(line) is not None
 
-        return any(re.search(pattern, line, re.IGNORECASE) for pattern in xss_patterns)
-
-    def _find_hardcoded_secrets(self, line: str) -> List[str]:
+    def _find_hardcoded_secrets(self, line: str, line_lower: str) -> List[str]:
         """Find hardcoded secrets in code"""
-        secrets = []
-
-        # Common secret patterns
-        secret_patterns = {
-            'password': r'password\s*=\s*["\'][^"\']{3,}["\']',
-            'api_key': r'api[_-]?key\s*=\s*["\'][^"\']{10,}["\']',
-            'secret': r'secret\s*=\s*["\'][^"\']{10,}["\']',
-            'token': r'token\s*=\s*["\'][^"\']{10,}["\']',
-            'private_key': r'private[_-]?key\s*=\s*["\'][^"\']{10,}["\']',
-            'aws_key': r'aws[_-]?(access[_-]?)?key[_-]?id\s*=\s*["\'][^"\']{10,}["\']',
-        }
-
-        for secret_type, pattern in secret_patterns.items():
-            if re.search(pattern, line, re.IGNORECASE):
-                # Exclude common test/placeholder values
-                if not any(placeholder in line.lower() for placeholder in [
-                    'your_', 'example', 'test', 'dummy', 'fake', 'placeholder', 'xxx'
-                ]):
-                    secrets.append(secret_type)
+        # Exclude common test/placeholder values before running the patterns
+        if _PLACEHOLDER_RE.search(line_lower):
+            return []
 
-        return secrets
+        return [
+            secret_type
+            for secret_type, pattern in _SECRET_PATTERNS.items()
+            if pattern.search(line)
+        ]
 
     def _has_weak_crypto(self, line: str, language: str) -> bool:
         """Check for weak cryptographic algorithms"""
-        weak_crypto_patterns = [
-            r'\bMD5\b',
-            r'\bSHA1\b',
-            r'\bDES\b',
-            r'\bRC4\b',
-            r'\.md5\(',
-            r'\.sha1\(',
-            r'hashlib\.md5',
-            r'hashlib\.sha1',
-            r'crypto\.createHash\(["\']md5',
-            r'crypto\.createHash\(["\']sha1',
-        ]
+        return _WEAK_CRYPTO_RE.search(line) is not None
 
-        return any(re.search(pattern, line, re.IGNORECASE) for pattern in weak_crypto_patterns)
-
-    def _logs_sensitive_data(self, line: str, language: str) -> bool:
+    def _logs_sensitive_data(self, line: str, line_lower: str, language: str) -> bool:
         """Check if line logs sensitive data"""
         # Check if it's a logging statement
-        logging_patterns = [
-            r'log\.',
-            r'logger\.',
-            r'console\.',
-            r'print\(',
-            r'println\(',
-            r'System\.out',
-        ]
-
-        is_logging = any(re.search(pattern, line, re.IGNORECASE) for pattern in logging_patterns)
+        is_logging = _LOGGING_RE.search(line) is not None
 
         if not is_logging:
             return False
 
         # Check for sensitive data keywords
-        sensitive_keywords = [
-            'password', 'passwd', 'pwd',
-            'token', 'secret', 'key',
-            'credit_card', 'creditcard', 'ssn',
-            'api_key', 'apikey',
-            'private_key', 'privatekey',
-            'authorization', 'auth',
-        ]
-
-        return any(keyword in line.lower() for keyword in sensitive_keywords)
-
-    def _has_insecure_deserialization(self, line: str, language: str) -> bool:
-        """Check for insecure deserialization"""
-        if language == "python":
-            return 'pickle.loads' in line or 'yaml.load(' in line
-        elif language in ["javascript", "typescript"]:
-            return 'eval(' in line or 'Function(' in line
-        elif language == "java":
-            return 'readObject()' in line or 'XMLDecoder' in line
-
-        return False
+        return _SENSITIVE_KEYWORD_RE.search(line_lower) is not None
 
-    def _enhance_prompt_with_security_context(
-        self, messages, context: ReviewContext, security_insights: Dict
-    ):
-        """Enhance prompt with security-specific context"""
-        # Get the human message (last message)
-        human_message = messages[-1]
+    def _has_insecure_deserialization(self, line: str, markers: Tuple[str, ...]) -> bool:
+        """Check for insecure deserialization calls of the file's language"""
+        return any(marker in line for marker in markers)
 
-        # Add security-specific instructions
-        security_context = self._build_security_context(context, security_insights)
+    def _build_security_guidelines(self, context: ReviewContext) -> str:
+        """Build the language-specific security guidelines for the changed files"""
+        languages = frozenset(f.language for f in context.file_changes if not f.is_binary)
+        return _security_guidelines(languages)
 
-        enhanced_content = f"{human_message.content}\n\n{security_context}"
-
-        # Replace the human message with enhanced version
-        from langchain_core.messages import HumanMessage
-        messages[-1] = HumanMessage(content=enhanced_content)
-
-        return messages
-
-    def _build_security_context(self, context: ReviewContext, security_insights: Dict) -> str:
+    def _build_security_context(self, context: ReviewContext, security_insights: Counter) -> str:
         """Build security-specific analysis context"""
         context_parts = []
 
-        # Language-specific security guidelines
-        languages = set(f.language for f in context.file_changes if not f.is_binary)
-        if languages:
-            context_parts.append("**Language-Specific Security Guidelines:**")
-
-            for lang in languages:
-                if lang == "python":
-                    context_parts.append("- Python: Watch for pickle deserialization, SQL injection in raw queries, command injection in subprocess, YAML unsafe loading")
-                elif lang == "javascript":
-                    context_parts.append("- JavaScript: Check for XSS via innerHTML, eval() usage, prototype pollution, insecure dependencies")
-                elif lang == "java":
-                    context_parts.append("- Java: Look for SQL injection, XXE vulnerabilities, insecure deserialization, path traversal")
-                elif lang in ["cpp", "c"]:
-                    context_parts.append("- C/C++: Check for buffer overflows, format string vulnerabilities, use-after-free, integer overflows")
-                elif lang == "go":
-                    context_parts.append("- Go: Watch for SQL injection, command injection, path traversal, insecure TLS configuration")
-
         # Security insights from pre-analysis
         if any(security_insights.values()):
-            context_parts.append("\n**Pre-Analysis Security Findings:**")
+            context_parts.append("**Pre-Analysis Security Findings:**")
 
-            if security_insights["sql_injection_risks"]:
-                count = len(security_insights["sql_injection_risks"])
-                context_parts.append(f"- Found {count} potential SQL injection risks")
+            count = security_insights["sql_injection_risks"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} potential SQL injection risks")
 
-            if security_insights["xss_risks"]:
-                count = len(security_insights["xss_risks"])
-                context_parts.append(f"- Found {count} potential XSS vulnerabilities")
+            count = security_insights["xss_risks"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} potential XSS vulnerabilities")
 
-            if security_insights["hardcoded_secrets"]:
-                count = len(security_insights["hardcoded_secrets"])
-                context_parts.append(f"- Found {count} potential hardcoded secrets")
+            count = security_insights["hardcoded_secrets"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} potential hardcoded secrets")
 
-            if security_insights["weak_crypto"]:
-                count = len(security_insights["weak_crypto"])
-                context_parts.append(f"- Found {count} uses of weak cryptographic algorithms")
+            count = security_insights["weak_crypto"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} uses of weak cryptographic algorithms")
 
-            if security_insights["sensitive_data_exposure"]:
-                count = len(security_insights["sensitive_data_exposure"])
-                context_parts.append(f"- Found {count} potential sensitive data exposures")
+            count = security_insights["sensitive_data_exposure"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} potential sensitive data exposures")
 
-            if security_insights["insecure_deserialization"]:
-                count = len(security_insights["insecure_deserialization"])
-                context_parts.append(f"- Found {count} insecure deserialization patterns")
+            count = security_insights["insecure_deserialization"]
+            if count:
+                context_parts.append(f"- Found {_format_count(count)} insecure deserialization patterns")
 
         # Application context
         file_types = self._categorize_security_context(context.file_changes)
         if file_types:
-            context_parts.append(f"\n**Security Context**: {', '.join(file_types)}")
-
-        # OWASP Top 10 reminder
-        context_parts.append("\n**OWASP Top 10 Focus Areas**: Injection, Broken Authentication, Sensitive Data Exposure, XXE, Broken Access Control, Security Misconfiguration, XSS, Insecure Deserialization, Using Components with Known Vulnerabilities, Insufficient Logging & Monitoring")
+            context_parts.append(f"\n**Security Context**: {', '.join(sorted(file_types))}")
 
         return "\n".join(context_parts)
 
@@ -463,24 +533,8 @@ Return an empty array [] if no security vulnerabilities are found."""
         categories = set()
 
         for file_change in file_changes:
-            path = file_change.file_path.lower()
-
-            if any(keyword in path for keyword in ['auth', 'login', 'session']):
-                categories.add("Authentication/Authorization")
-            elif any(keyword in path for keyword in ['api', 'controller', 'endpoint']):
-                categories.add("API endpoints")
-            elif any(keyword in path for keyword in ['database', 'db', 'sql', 'query']):
-                categories.add("Database layer")
-            elif any(keyword in path for keyword in ['crypto', 'encrypt', 'hash']):
-                categories.add("Cryptography")
-            elif any(keyword in path for keyword in ['user', 'input', 'form']):
-                categories.add("User input handling")
-            elif any(keyword in path for keyword in ['config', 'setting']):
-                categories.add("Configuration")
-            elif any(keyword in path for keyword in ['payment', 'billing']):
-                categories.add("Payment processing")
-            else:
-                categories.add("Application logic")
+            match = _SECURITY_CONTEXT_RE.match(file_change.file_path.lower())
+            categories.add(_SECURITY_CONTEXTS[match.lastgroup] if match else "Application logic")
 
         return categories
 
@@ -1,10 +1,14 @@
 """
 API middleware for security and rate limiting
 """
+import asyncio
+import hashlib
+import hmac
 import time
 import logging
-from typing import Dict, Optional
-from collections import defaultdict
+import weakref
+from typing import Deque, Dict, Optional
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 
 from fastapi import Request, HTTPException, status
@@ -18,6 +22,30 @@ logger = logging.getLogger(__name__)
 # API Key header
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Digest of the configured API key; comparing fixed-size digests with
+# hmac.compare_digest keeps verification constant-time
+_configured_api_key = settings.api_key
+_API_KEY_DIGEST: Optional[bytes] = (
+    hashlib.sha256(_configured_api_key.encode()).digest() if _configured_api_key else None
+)
+
+
+# Live rate limiters, so the app lifespan can start and stop their cleanup;
+# Starlette builds the middleware stack before running lifespan startup
+_rate_limiters: "weakref.WeakSet[RateLimitMiddleware]" = weakref.WeakSet()
+
+
+def start_rate_limit_cleanup():
+    """Start the periodic cleanup of every rate limiter on the running event loop"""
+    for rate_limiter in _rate_limiters:
+        rate_limiter.start_cleanup()
+
+
+async def stop_rate_limit_cleanup():
+    """Stop the periodic cleanup of every rate limiter"""
+    for rate_limiter in list(_rate_limiters):
+        await rate_limiter.stop_cleanup()
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """Rate limiting middleware"""
@@ -25,21 +53,34 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, requests_per_minute: int = 10):
         super().__init__(app)
         self.requests_per_minute = requests_per_minute
-        self.requests: Dict[str, list] = defaultdict(list)
+        # Per-IP request times, oldest first; no IP can hold more than the limit
+        self.requests: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=requests_per_minute)
+        )
         self.cleanup_interval = 60  # Clean up old entries every 60 seconds
-        self.last_cleanup = time.time()
+        self._cleanup_task: Optional[asyncio.Task] = None
+        _rate_limiters.add(self)
+    
+    def start_cleanup(self):
+        """Start removing old request records in the background"""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._cleanup_periodically())
+    
+    async def stop_cleanup(self):
+        """Cancel the background cleanup and wait for it to finish"""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
     
     async def dispatch(self, request: Request, call_next):
         """Process request with rate limiting"""
         # Get client IP
         client_ip = request.client.host
         
-        # Clean up old entries periodically
-        current_time = time.time()
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            self._cleanup_old_requests()
-            self.last_cleanup = current_time
-        
         # Check rate limit
         if not self._check_rate_limit(client_ip):
             logger.warning(f"Rate limit exceeded for IP: {client_ip}")
@@ -48,8 +89,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 detail=f"Rate limit exceeded. Maximum {self.requests_per_minute} requests per minute."
             )
         
-        # Record request
-        self.requests[client_ip].append(current_time)
+        # Record request; nothing is awaited between the check and this
+        # append, so concurrent requests from one IP can't interleave them
+        self.requests[client_ip].append(time.monotonic())
         
         # Process request
         response = await call_next(request)
@@ -57,34 +99,35 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     
     def _check_rate_limit(self, client_ip: str) -> bool:
         """Check if client has exceeded rate limit"""
-        current_time = time.time()
+        current_time = time.monotonic()
         cutoff_time = current_time - 60  # 1 minute ago
         
-        # Get recent requests
-        recent_requests = [
-            req_time for req_time in self.requests[client_ip]
-            if req_time > cutoff_time
-        ]
-        
-        # Update stored requests
-        self.requests[client_ip] = recent_requests
+        # Drop requests older than the window from the front
+        recent_requests = self.requests[client_ip]
+        while recent_requests and recent_requests[0] <= cutoff_time:
+            recent_requests.popleft()
         
         # Check limit
         return len(recent_requests) < self.requests_per_minute
     
+    async def _cleanup_periodically(self):
+        """Remove old request records every cleanup_interval seconds"""
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            self._cleanup_old_requests()
+    
     def _cleanup_old_requests(self):
         """Remove old request records"""
-        current_time = time.time()
+        current_time = time.monotonic()
         cutoff_time = current_time - 120  # Keep last 2 minutes
         
         for client_ip in list(self.requests.keys()):
-            self.requests[client_ip] = [
-                req_time for req_time in self.requests[client_ip]
-                if req_time > cutoff_time
-            ]
+            request_times = self.requests[client_ip]
+            while request_times and request_times[0] <= cutoff_time:
+                request_times.popleft()
             
             # Remove empty entries
-            if not self.requests[client_ip]:
+            if not request_times:
                 del self.requests[client_ip]
 
 
@@ -99,27 +142,34 @@ async def verify_api_key(api_key: Optional[str] = None) -> bool:
         True if valid or no key required, False otherwise
     """
     # If no API key is configured, allow all requests
-    if not hasattr(settings, 'api_key') or not settings.api_key:
+    if _API_KEY_DIGEST is None:
         return True
     
     # If API key is configured, verify it
     if not api_key:
         return False
     
-    return api_key == settings.api_key
+    return hmac.compare_digest(hashlib.sha256(api_key.encode()).digest(), _API_KEY_DIGEST)
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Add security headers to responses"""
     
+    # Static headers pre-encoded in Starlette's raw (lowercase name, value) form
+    _SECURITY_HEADERS = (
+        (b"x-content-type-options", b"nosniff"),
+        (b"x-frame-options", b"DENY"),
+        (b"x-xss-protection", b"1; mode=block"),
+        (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+    )
+    
     async def dispatch(self, request: Request, call_next):
         """Add security headers"""
         response = await call_next(request)
         
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        # Add security headers the route hasn't set itself
+        raw_headers = response.raw_headers
+        present = {name for name, _ in raw_headers}
+        raw_headers.extend(header for header in self._SECURITY_HEADERS if header[0] not in present)
         
         return response
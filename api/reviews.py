@@ -1,47 +1,81 @@
 """
 FastAPI endpoints for PR reviews
 """
+import asyncio
+import base64
+import binascii
+import hashlib
 import logging
-from typing import Optional, List
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, List, Set, Tuple
 from datetime import datetime
+from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, Depends, Query, status
-from fastapi.responses import JSONResponse
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib
+    orjson = None
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Response, status
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.api_models import ReviewRequest, ReviewResponse
+from agents import SingleFlight
+from models.api_models import ReviewRequest, ReviewResponse, ReviewStatus
 from models import ReviewConfig, SeverityLevel, AnalysisCategory
 from services import PRReviewService, LLMClientFactory, LLMProvider
-from repositories import get_db, ReviewRepository, HistoryFilters
+from repositories import get_db, db_manager, ReviewRepository, ReviewResult, HistoryFilters
 from config import settings
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/reviews", tags=["reviews"])
+# Categories reviewed when a request doesn't configure any
+_DEFAULT_CATEGORIES = (
+    AnalysisCategory.LOGIC.value,
+    AnalysisCategory.READABILITY.value,
+    AnalysisCategory.PERFORMANCE.value,
+    AnalysisCategory.SECURITY.value,
+)
+
+# Review payloads carry every finding, so they are rendered with orjson
+# when it is installed
+router = APIRouter(
+    prefix="/api/reviews",
+    tags=["reviews"],
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse
+)
+
+
+@lru_cache(maxsize=1)
+def _build_llm():
+    """Build the LLM client once; it keeps no per-request state and its HTTP pool is shared"""
+    llm_factory = LLMClientFactory()
+    
+    # Get the appropriate API key based on provider
+    provider = settings.llm_provider.lower()
+    if provider == "nvidia":
+        api_key = settings.nvidia_api_key
+    else:
+        raise ValueError(f"Unsupported LLM provider: {provider}")
+    
+    # Create LLM client wrapper
+    llm_client = llm_factory.create_client(
+        provider=LLMProvider(provider),
+        api_key=api_key,
+        model=settings.llm_model
+    )
+    
+    # Return the actual LangChain model, not the wrapper
+    # The agents expect a BaseLanguageModel, not LLMClient
+    return llm_client._get_client()
 
 
 def get_llm():
     """Get LLM instance"""
     try:
-        llm_factory = LLMClientFactory()
-        
-        # Get the appropriate API key based on provider
-        provider = settings.llm_provider.lower()
-        if provider == "nvidia":
-            api_key = settings.nvidia_api_key
-        else:
-            raise ValueError(f"Unsupported LLM provider: {provider}")
-        
-        # Create LLM client wrapper
-        llm_client = llm_factory.create_client(
-            provider=LLMProvider(provider),
-            api_key=api_key,
-            model=settings.llm_model
-        )
-        
-        # Return the actual LangChain model, not the wrapper
-        # The agents expect a BaseLanguageModel, not LLMClient
-        return llm_client._get_client()
+        return _build_llm()
         
     except Exception as e:
         logger.error(f"Failed to create LLM client: {e}")
@@ -51,11 +85,164 @@ def get_llm():
         )
 
 
-@router.post("", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
-async def create_review(
+async def get_repo(db: AsyncSession = Depends(get_db)) -> ReviewRepository:
+    """FastAPI dependency for a review repository bound to the request's session"""
+    return ReviewRepository(db)
+
+
+def _encode_cursor(result: ReviewResult) -> str:
+    """Encode a review's position in the history ordering as an opaque cursor"""
+    return base64.urlsafe_b64encode(f"{result.timestamp.isoformat()}|{result.review_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a history cursor into its (timestamp, review_id) position"""
+    try:
+        timestamp, review_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), review_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _build_review_config(request: ReviewRequest) -> ReviewConfig:
+    """Create the review config from a request"""
+    return ReviewConfig(
+        severity_threshold=request.config.severity_threshold if request.config else None,
+        enabled_categories=request.config.enabled_categories if request.config else list(_DEFAULT_CATEGORIES),
+        custom_rules=request.config.custom_rules if request.config else None
+    )
+
+
+async def _run_review(
     request: ReviewRequest,
-    db: AsyncSession = Depends(get_db)
-):
+    db: AsyncSession,
+    review_id: Optional[str] = None
+) -> ReviewResponse:
+    """
+    Run the review pipeline for a request
+    
+    Args:
+        request: Review request with a PR URL or diff content
+        db: Database session the review is persisted with
+        review_id: ID to persist the review under (optional)
+        
+    Returns:
+        ReviewResponse with findings and formatted comments
+    """
+    # Get LLM client
+    llm = get_llm()
+    
+    # Create review service
+    service = PRReviewService(
+        llm=llm,
+        github_token=request.github_token or settings.github_token,
+        db_session=db
+    )
+    
+    # Create config from request
+    config = _build_review_config(request)
+    
+    # Perform review based on input type
+    if request.pr_url:
+        return await service.review_pr_from_url(
+            pr_url=request.pr_url,
+            config=config,
+            review_id=review_id
+        )
+    
+    return await service.review_from_diff(
+        diff_content=request.diff_content,
+        repository=request.repository,
+        pr_number=request.pr_number,
+        config=config,
+        review_id=review_id
+    )
+
+
+def _require_review_input(request: ReviewRequest):
+    """Reject requests with neither a PR URL nor diff content"""
+    if not (request.pr_url or request.diff_content):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Either pr_url or diff_content must be provided"
+        )
+
+
+# Identical review requests in flight at once (CI retries, duplicate webhook
+# deliveries) share one pipeline run and its stored review
+_review_flights = SingleFlight()
+
+
+def _review_request_key(request: ReviewRequest) -> str:
+    """Hash everything in a request that affects its review, including the token"""
+    return hashlib.sha256(request.model_dump_json().encode()).hexdigest()
+
+
+async def _run_shared_review(request: ReviewRequest) -> ReviewResponse:
+    """Run a coalesced review with its own session, since it outlives any one caller's"""
+    async with db_manager.get_session() as db:
+        return await _run_review(request, db)
+
+
+# Background reviews that are running or failed, by review ID; finished
+# reviews are dropped since the database then has their status
+_review_jobs: Dict[str, ReviewStatus] = {}
+_review_tasks: Set[asyncio.Task] = set()
+
+# Failed reviews stay queryable for this many seconds
+_FAILED_JOB_TTL = 3600.0
+_failed_job_expiry: "OrderedDict[str, float]" = OrderedDict()
+
+
+def _evict_expired_jobs():
+    """Forget failed background reviews older than the TTL, oldest first"""
+    now = time.monotonic()
+    while _failed_job_expiry:
+        review_id, expires_at = next(iter(_failed_job_expiry.items()))
+        if expires_at > now:
+            break
+        del _failed_job_expiry[review_id]
+        _review_jobs.pop(review_id, None)
+
+
+def _record_failed_job(review_id: str, error_message: str):
+    """Mark a background review failed until its status expires"""
+    _evict_expired_jobs()
+    _review_jobs[review_id] = ReviewStatus(review_id=review_id, status="failed", error_message=error_message)
+    _failed_job_expiry[review_id] = time.monotonic() + _FAILED_JOB_TTL
+
+
+async def _run_review_job(review_id: str, request: ReviewRequest):
+    """Run a background review with its own database session and record the outcome"""
+    try:
+        async with db_manager.get_session() as db:
+            response = await _run_review(request, db, review_id=review_id)
+        
+        # The review is only retrievable once stored under the reserved ID
+        if response.review_id == review_id:
+            _review_jobs.pop(review_id, None)
+            logger.info(f"Background review {review_id} completed: {len(response.findings)} findings")
+        else:
+            logger.error(f"Background review {review_id} finished but was not persisted")
+            _record_failed_job(review_id, "Review completed but could not be persisted")
+    except Exception as e:
+        logger.error(f"Background review {review_id} failed: {e}", exc_info=True)
+        _record_failed_job(review_id, e.detail if isinstance(e, HTTPException) else str(e))
+
+
+async def cancel_review_jobs():
+    """Cancel running background reviews and wait for them to stop"""
+    tasks = list(_review_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@router.post("", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
+async def create_review(request: ReviewRequest):
     """
     Create a new code review
     
@@ -65,47 +252,12 @@ async def create_review(
     try:
         logger.info(f"Received review request: {request.pr_url or 'manual diff'}")
         
-        # Get LLM client
-        llm = get_llm()
-        
-        # Create review service
-        service = PRReviewService(
-            llm=llm,
-            github_token=request.github_token or settings.github_token,
-            db_session=db
-        )
-        
-        # Create config from request
-        config = ReviewConfig(
-            severity_threshold=request.config.severity_threshold if request.config else None,
-            enabled_categories=request.config.enabled_categories if request.config else [
-                AnalysisCategory.LOGIC.value,
-                AnalysisCategory.READABILITY.value,
-                AnalysisCategory.PERFORMANCE.value,
-                AnalysisCategory.SECURITY.value
-            ],
-            custom_rules=request.config.custom_rules if request.config else None
+        _require_review_input(request)
+        response = await _review_flights.do(
+            _review_request_key(request),
+            lambda: _run_shared_review(request)
         )
         
-        # Perform review based on input type
-        if request.pr_url:
-            response = await service.review_pr_from_url(
-                pr_url=request.pr_url,
-                config=config
-            )
-        elif request.diff_content:
-            response = await service.review_from_diff(
-                diff_content=request.diff_content,
-                repository=request.repository,
-                pr_number=request.pr_number,
-                config=config
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Either pr_url or diff_content must be provided"
-            )
-        
         logger.info(f"Review completed: {len(response.findings)} findings")
         
         return response
@@ -126,8 +278,33 @@ async def create_review(
         )
 
 
+@router.post("/async", response_model=ReviewStatus, status_code=status.HTTP_202_ACCEPTED)
+async def create_review_async(request: ReviewRequest):
+    """
+    Start a code review in the background
+    
+    Returns immediately with the review ID; poll /{review_id}/status until
+    the review is completed, then fetch it from /{review_id}. No database
+    session is held while the LLM agents run.
+    """
+    logger.info(f"Received background review request: {request.pr_url or 'manual diff'}")
+    
+    _require_review_input(request)
+    
+    review_id = str(uuid4())
+    _review_jobs[review_id] = ReviewStatus(review_id=review_id, status="in_progress")
+    
+    # Keep a reference so the task isn't garbage collected while it runs
+    task = asyncio.create_task(_run_review_job(review_id, request))
+    _review_tasks.add(task)
+    task.add_done_callback(_review_tasks.discard)
+    
+    return _review_jobs[review_id]
+
+
 @router.get("/history", response_model=List[ReviewResponse])
 async def get_review_history(
+    response: Response,
     repository: Optional[str] = Query(None, description="Filter by repository"),
     pr_number: Optional[int] = Query(None, description="Filter by PR number"),
     start_date: Optional[datetime] = Query(None, description="Filter by start date"),
@@ -135,8 +312,9 @@ async def get_review_history(
     severity: Optional[str] = Query(None, description="Filter by severity level"),
     category: Optional[str] = Query(None, description="Filter by category"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of results"),
-    offset: int = Query(0, ge=0, description="Offset for pagination"),
-    db: AsyncSession = Depends(get_db)
+    offset: int = Query(0, ge=0, description="Offset for pagination (ignored when cursor is set)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    repo: ReviewRepository = Depends(get_repo)
 ):
     """
     Get review history with optional filtering
@@ -147,12 +325,14 @@ async def get_review_history(
     - Date range
     - Severity level
     - Category
+    
+    Full pages set an X-Next-Cursor header; pass it back as cursor to fetch
+    the next page with an index seek instead of an offset scan.
     """
     try:
-        logger.info(f"Fetching review history: repo={repository}, pr={pr_number}")
+        cursor_timestamp, cursor_review_id = _decode_cursor(cursor) if cursor else (None, None)
         
-        # Create repository instance
-        repo = ReviewRepository(db)
+        logger.info(f"Fetching review history: repo={repository}, pr={pr_number}")
         
         # Create filters
         filters = HistoryFilters(
@@ -163,29 +343,37 @@ async def get_review_history(
             severity=severity,
             category=category,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor_timestamp=cursor_timestamp,
+            cursor_review_id=cursor_review_id
         )
         
         # Query reviews
         review_results = await repo.query_reviews(filters)
         
-        # Convert to response models
-        responses = []
-        for result in review_results:
-            response = ReviewResponse(
+        # Convert to response models; the stored results' parts were
+        # validated when they were loaded, so they aren't validated again here
+        responses = [
+            ReviewResponse.model_construct(
                 review_id=result.review_id,
                 pr_metadata=result.pr_metadata,
                 findings=result.findings,
-                summary=None,  # Summary would need to be reconstructed
-                formatted_comments="",  # Not stored in DB
+                summary=result.summary,
                 timestamp=result.timestamp
             )
-            responses.append(response)
+            for result in review_results
+        ]
+        
+        # A full page may have more after it
+        if len(review_results) == limit:
+            response.headers["X-Next-Cursor"] = _encode_cursor(review_results[-1])
         
         logger.info(f"Returned {len(responses)} review results")
         
         return responses
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch review history: {e}", exc_info=True)
         raise HTTPException(
@@ -197,7 +385,7 @@ async def get_review_history(
 @router.get("/{review_id}/status")
 async def get_review_status(
     review_id: str,
-    db: AsyncSession = Depends(get_db)
+    repo: ReviewRepository = Depends(get_repo)
 ):
     """
     Get the status of a specific review
@@ -207,8 +395,11 @@ async def get_review_status(
     try:
         logger.info(f"Fetching status for review: {review_id}")
         
-        # Create repository instance
-        repo = ReviewRepository(db)
+        # Background reviews report their own status until they're stored
+        _evict_expired_jobs()
+        job = _review_jobs.get(review_id)
+        if job is not None:
+            return job
         
         # Get review
         review_result = await repo.get_review(review_id)
@@ -242,7 +433,7 @@ async def get_review_status(
 @router.get("/{review_id}", response_model=ReviewResponse)
 async def get_review(
     review_id: str,
-    db: AsyncSession = Depends(get_db)
+    repo: ReviewRepository = Depends(get_repo)
 ):
     """
     Get a specific review by ID
@@ -252,9 +443,6 @@ async def get_review(
     try:
         logger.info(f"Fetching review: {review_id}")
         
-        # Create repository instance
-        repo = ReviewRepository(db)
-        
         # Get review
         review_result = await repo.get_review(review_id)
         
@@ -269,7 +457,7 @@ async def get_review(
             review_id=review_result.review_id,
             pr_metadata=review_result.pr_metadata,
             findings=review_result.findings,
-            summary=None,  # Would need to be reconstructed
+            summary=review_result.summary,
             formatted_comments="",  # Not stored in DB
             timestamp=review_result.timestamp
         )
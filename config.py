@@ -0,0 +1,34 @@
+"""
+Application settings loaded from environment variables and .env
+"""
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Application settings"""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # Database
+    database_url: str  # Required; set DATABASE_URL
+    db_pool_size: int = 20  # Persistent connections; sized for concurrent reviews
+    db_max_overflow: int = 10  # Extra connections allowed under burst load
+
+    # GitHub
+    github_token: Optional[str] = None
+
+    # LLM
+    llm_provider: str = "nvidia"
+    llm_model: Optional[str] = None  # None = per-agent default models
+    nvidia_api_key: Optional[str] = None
+    google_api_key: Optional[str] = None
+    llm_max_concurrency: int = 8  # LLM requests in flight across all agents
+
+    # API
+    api_key: Optional[str] = None  # Required in X-API-Key when set
+    api_rate_limit: int = 10  # Requests per minute per IP
+
+
+settings = Settings()
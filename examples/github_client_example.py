@@ -14,7 +14,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from services.github_client import GitHubAPIClient, GitHubAPIError
+from services.github_client import GitHubAPIClient, GitHubAPIError, close_shared_github_http_client
 
 
 async def example_fetch_pr_data():
@@ -56,8 +56,8 @@ async def example_fetch_pr_data():
         print(f"Unexpected error: {e}")
     
     finally:
-        # Clean up
-        await client.close()
+        # Clean up; GitHub clients share one connection pool per event loop
+        await close_shared_github_http_client()
 
 
 async def example_parse_urls():
@@ -153,17 +153,17 @@ def example_readability_analysis():
             
             # Analyze complexity
             try:
-                complexity_insights = agent._analyze_complexity(context)
+                complexity_insights = agent._analyze_complexity(context).insights
                 
                 print(f"\nComplexity Analysis:")
                 if complexity_insights["deep_nesting"]:
-                    print(f"  • Deep nesting: {len(complexity_insights['deep_nesting'])} instances")
+                    print(f"  • Deep nesting: {complexity_insights['deep_nesting']} instances")
                 if complexity_insights["magic_numbers"]:
-                    print(f"  • Magic numbers: {len(complexity_insights['magic_numbers'])} found")
+                    print(f"  • Magic numbers: {complexity_insights['magic_numbers']} found")
                 if complexity_insights["poor_names"]:
-                    print(f"  • Poor names: {len(complexity_insights['poor_names'])} found")
+                    print(f"  • Poor names: {complexity_insights['poor_names']} found")
                 if complexity_insights["long_parameter_lists"]:
-                    print(f"  • Long parameter lists: {len(complexity_insights['long_parameter_lists'])} found")
+                    print(f"  • Long parameter lists: {complexity_insights['long_parameter_lists']} found")
                 
                 if not any(complexity_insights.values()):
                     print("  • No complexity issues detected in pre-analysis")
@@ -2,14 +2,21 @@
 PR Review Agent - Main application entry point
 """
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
 
-from api.reviews import router as reviews_router
-from api.middleware import RateLimitMiddleware, SecurityHeadersMiddleware
+from api.reviews import router as reviews_router, cancel_review_jobs
+from api.middleware import (
+    RateLimitMiddleware,
+    SecurityHeadersMiddleware,
+    start_rate_limit_cleanup,
+    stop_rate_limit_cleanup
+)
 from repositories import db_manager
+from services import close_shared_http_client, close_shared_github_http_client
 from config import settings
 
 # Configure logging
@@ -21,12 +28,41 @@ logging.basicConfig(
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the database and background tasks, and release them on shutdown"""
+    try:
+        db_manager.initialize()
+        logging.info("Database initialized")
+    except Exception as e:
+        logging.warning(f"Database initialization skipped: {e}")
+        logging.info("Running without database - reviews won't be persisted")
+    
+    start_rate_limit_cleanup()
+    
+    yield
+    
+    await cancel_review_jobs()
+    await stop_rate_limit_cleanup()
+    
+    await db_manager.close()
+    logging.info("Database connections closed")
+    
+    await close_shared_http_client()
+    logging.info("LLM connection pool closed")
+    
+    await close_shared_github_http_client()
+    logging.info("GitHub connection pool closed")
+
+
 app = FastAPI(
     title="PR Review Agent",
     description="Automated Pull Request Review Agent using Multi-Agent Architecture",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -51,24 +87,6 @@ app.add_middleware(
 app.include_router(reviews_router)
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database on startup"""
-    try:
-        db_manager.initialize()
-        logging.info("Database initialized")
-    except Exception as e:
-        logging.warning(f"Database initialization skipped: {e}")
-        logging.info("Running without database - reviews won't be persisted")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Close database connections on shutdown"""
-    await db_manager.close()
-    logging.info("Database connections closed")
-
-
 @app.get("/")
 async def root():
     return {
@@ -1,6 +1,7 @@
 """
 Core data models for internal system operations
 """
+import sys
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field, validator
@@ -36,7 +37,13 @@ class FileChange(BaseModel):
     def validate_file_path(cls, v):
         if not v or not v.strip():
             raise ValueError("File path cannot be empty")
-        return v.strip()
+        # Interned so the many per-finding path comparisons mostly hit the identity check
+        return sys.intern(v.strip())
+
+    @validator('language')
+    def intern_language(cls, v):
+        # Few distinct values, compared on every line by the analyzers
+        return sys.intern(v)
 
 
 class ParsedDiff(BaseModel):
@@ -26,12 +26,22 @@ class DatabaseManager:
         
     def initialize(self):
         """Initialize database engine and session factory"""
+        if "sqlite" in self.database_url:
+            pool_options = {"poolclass": NullPool}
+        else:
+            # Sized for concurrent review requests; the default of 5 runs out
+            # while background reviews and history queries overlap
+            pool_options = {
+                "pool_size": settings.db_pool_size,
+                "max_overflow": settings.db_max_overflow,
+            }
+        
         self.engine = create_async_engine(
             self.database_url,
             echo=False,  # Set to True for SQL logging in development
-            poolclass=NullPool if "sqlite" in self.database_url else None,
             pool_pre_ping=True,
             pool_recycle=3600,  # Recycle connections after 1 hour
+            **pool_options
         )
         
         self.session_factory = async_sessionmaker(
@@ -2,11 +2,11 @@
 Review Repository for persisting and retrieving review results
 """
 import logging
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import select, and_, or_, desc
+from sqlalchemy import select, and_, or_, desc, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -15,6 +15,9 @@ from models import Finding, ReviewSummary, PRMetadata, ReviewConfig, SeverityLev
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip when streaming query results
+_QUERY_CHUNK_SIZE = 200
+
 
 class ReviewResult:
     """Review result with all associated data"""
@@ -26,7 +29,8 @@ class ReviewResult:
         commit_sha: str,
         findings: List[Finding],
         timestamp: datetime,
-        config_used: ReviewConfig
+        config_used: ReviewConfig,
+        summary: Optional[ReviewSummary] = None
     ):
         self.review_id = review_id
         self.pr_metadata = pr_metadata
@@ -34,6 +38,7 @@ class ReviewResult:
         self.findings = findings
         self.timestamp = timestamp
         self.config_used = config_used
+        self.summary = summary
 
 
 class HistoryFilters:
@@ -48,7 +53,9 @@ class HistoryFilters:
         severity: Optional[str] = None,
         category: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor_timestamp: Optional[datetime] = None,
+        cursor_review_id: Optional[str] = None
     ):
         self.repository = repository
         self.pr_number = pr_number
@@ -58,6 +65,10 @@ class HistoryFilters:
         self.category = category
         self.limit = limit
         self.offset = offset
+        # Position of the last review on the previous page; when set, the
+        # page starts right after it instead of skipping offset rows
+        self.cursor_timestamp = cursor_timestamp
+        self.cursor_review_id = cursor_review_id
 
 
 class ReviewRepository:
@@ -79,7 +90,8 @@ class ReviewRepository:
         commit_sha: str,
         findings: List[Finding],
         config: ReviewConfig,
-        summary: Optional[ReviewSummary] = None
+        summary: Optional[ReviewSummary] = None,
+        review_id: Optional[str] = None
     ) -> str:
         """
         Save review results to database
@@ -90,13 +102,14 @@ class ReviewRepository:
             findings: List of findings
             config: Review configuration used
             summary: Optional review summary
+            review_id: ID to store the review under; generated when omitted
             
         Returns:
             Review ID (UUID string)
         """
         try:
-            # Generate review ID
-            review_id = str(uuid4())
+            # Generate review ID unless the caller reserved one
+            review_id = review_id or str(uuid4())
             
             # Create review model
             review = ReviewModel(
@@ -222,25 +235,41 @@ class ReviewRepository:
             if filters.end_date:
                 conditions.append(ReviewModel.timestamp <= filters.end_date)
             
+            # Finding-level filters run in SQL so LIMIT and cursors count
+            # only matching reviews
+            finding_conditions = []
+            if filters.severity:
+                finding_conditions.append(func.lower(FindingModel.severity) == filters.severity.lower())
+            if filters.category:
+                finding_conditions.append(func.lower(FindingModel.category) == filters.category.lower())
+            if finding_conditions:
+                conditions.append(ReviewModel.findings.any(and_(*finding_conditions)))
+            
+            # Seek past the previous page's last review
+            if filters.cursor_timestamp is not None and filters.cursor_review_id is not None:
+                conditions.append(or_(
+                    ReviewModel.timestamp < filters.cursor_timestamp,
+                    and_(
+                        ReviewModel.timestamp == filters.cursor_timestamp,
+                        ReviewModel.review_id < filters.cursor_review_id
+                    )
+                ))
+            
             if conditions:
                 stmt = stmt.where(and_(*conditions))
             
-            # Order by timestamp descending
-            stmt = stmt.order_by(desc(ReviewModel.timestamp))
+            # Order by timestamp descending, with the ID as a tie-breaker so
+            # cursors identify a unique position
+            stmt = stmt.order_by(desc(ReviewModel.timestamp), desc(ReviewModel.review_id))
             
             # Apply pagination
-            stmt = stmt.limit(filters.limit).offset(filters.offset)
+            stmt = stmt.limit(filters.limit)
+            if filters.cursor_timestamp is None and filters.offset:
+                stmt = stmt.offset(filters.offset)
             
-            # Execute query
-            result = await self.session.execute(stmt)
-            review_models = result.scalars().all()
-            
-            # Convert to ReviewResult objects
-            reviews = [self._model_to_result(model) for model in review_models]
-            
-            # Apply finding-level filters if specified
-            if filters.severity or filters.category:
-                reviews = self._filter_by_findings(reviews, filters)
+            # Stream rows in chunks and convert each as it arrives, so the
+            # ORM objects for the whole page are never held at once
+            reviews = [review async for review in self._stream_results(stmt)]
             
             logger.debug(f"Query returned {len(reviews)} reviews")
             
@@ -250,6 +279,12 @@ class ReviewRepository:
             logger.error(f"Failed to query reviews: {e}", exc_info=True)
             return []
     
+    async def _stream_results(self, stmt) -> AsyncIterator[ReviewResult]:
+        """Yield ReviewResults for a review query, fetching rows in chunks"""
+        review_models = await self.session.stream_scalars(stmt.execution_options(yield_per=_QUERY_CHUNK_SIZE))
+        async for model in review_models:
+            yield self._model_to_result(model)
+    
     async def get_reviews_by_pr(
         self,
         repository: str,
@@ -310,45 +345,26 @@ class ReviewRepository:
             custom_rules=config_data.get("custom_rules")
         )
         
+        # Create summary, counting from the findings where it wasn't stored
+        summary_data = model.summary or {}
+        summary = ReviewSummary(
+            total_findings=summary_data.get("total_findings", len(findings)),
+            findings_by_severity=summary_data.get("findings_by_severity") or self._count_by_severity(findings),
+            findings_by_category=summary_data.get("findings_by_category") or self._count_by_category(findings),
+            files_analyzed=summary_data.get("files_analyzed", len(set(f.file_path for f in findings))),
+            lines_changed=summary_data.get("lines_changed", 0)
+        )
+        
         return ReviewResult(
             review_id=model.review_id,
             pr_metadata=pr_metadata,
             commit_sha=model.commit_sha,
             findings=findings,
             timestamp=model.timestamp,
-            config_used=config
+            config_used=config,
+            summary=summary
         )
     
-    def _filter_by_findings(
-        self,
-        reviews: List[ReviewResult],
-        filters: HistoryFilters
-    ) -> List[ReviewResult]:
-        """Filter reviews based on finding-level criteria"""
-        filtered = []
-        
-        for review in reviews:
-            # Check if review has findings matching criteria
-            matching_findings = review.findings
-            
-            if filters.severity:
-                matching_findings = [
-                    f for f in matching_findings
-                    if f.severity.value.lower() == filters.severity.lower()
-                ]
-            
-            if filters.category:
-                matching_findings = [
-                    f for f in matching_findings
-                    if f.category.value.lower() == filters.category.lower()
-                ]
-            
-            # Include review if it has matching findings
-            if matching_findings:
-                filtered.append(review)
-        
-        return filtered
-    
     def _count_by_severity(self, findings: List[Finding]) -> Dict[str, int]:
         """Count findings by severity"""
         counts = {}
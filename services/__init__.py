@@ -1,6 +1,11 @@
 # Services package
 
-from .github_client import GitHubAPIClient, GitHubAPIError
+from .github_client import (
+    GitHubAPIClient,
+    GitHubAPIError,
+    get_shared_github_http_client,
+    close_shared_github_http_client
+)
 from .diff_parser import DiffParser, DiffParseError
 from .llm_client import (
     LLMClient, 
@@ -9,6 +14,8 @@ from .llm_client import (
     LLMProvider,
     get_default_llm_client,
     set_default_llm_client,
+    get_shared_http_client,
+    close_shared_http_client,
     with_retry
 )
 from .review_orchestrator import ReviewOrchestrator, AgentResult, ReviewState
@@ -18,6 +25,8 @@ from .pr_review_service import PRReviewService
 __all__ = [
     "GitHubAPIClient",
     "GitHubAPIError",
+    "get_shared_github_http_client",
+    "close_shared_github_http_client",
     "DiffParser",
     "DiffParseError",
     "LLMClient",
@@ -26,6 +35,8 @@ __all__ = [
     "LLMProvider",
     "get_default_llm_client",
     "set_default_llm_client",
+    "get_shared_http_client",
+    "close_shared_http_client",
     "with_retry",
     "ReviewOrchestrator",
     "AgentResult",
@@ -4,6 +4,7 @@ GitHub API Client for fetching PR data and diffs
 import re
 import asyncio
 import logging
+import weakref
 from typing import Optional, Tuple
 from urllib.parse import urlparse
 
@@ -16,6 +17,45 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Supported GitHub PR URL formats, tried in order
+_PR_URL_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"github\.com/([^/]+/[^/]+)/pull/(\d+)",
+    r"github\.com/([^/]+/[^/]+)/pulls/(\d+)",
+    r"api\.github\.com/repos/([^/]+/[^/]+)/pulls/(\d+)"
+))
+
+# One keep-alive connection pool shared by every GitHubAPIClient; a client is
+# created per review, and each would otherwise open its own TLS connections.
+# Its connections belong to the event loop that opened them, so each loop
+# gets its own pool.
+_shared_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_github_http_client() -> httpx.AsyncClient:
+    """Get or create the running event loop's HTTP client shared by all GitHub API clients"""
+    loop = asyncio.get_running_loop()
+    client = _shared_http_clients.get(loop)
+    
+    if client is None or client.is_closed:
+        client = _shared_http_clients[loop] = httpx.AsyncClient(
+            headers={"Accept": "application/vnd.github.v3+json"},
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=30.0,
+            follow_redirects=True
+        )
+    
+    return client
+
+
+async def close_shared_github_http_client():
+    """Close the running event loop's shared GitHub HTTP client"""
+    client = _shared_http_clients.pop(asyncio.get_running_loop(), None)
+    
+    if client is not None:
+        await client.aclose()
+
 
 class GitHubAPIError(Exception):
     """Custom exception for GitHub API errors"""
@@ -34,7 +74,8 @@ class GitHubAPIClient:
         """
         self.token = token or settings.github_token
         self._github = None
-        self._http_client = None
+        # Sent per request since the connection pool is shared across tokens
+        self._auth_headers = {"Authorization": f"token {self.token}"} if self.token else {}
         
     def _get_github_client(self) -> Github:
         """Get authenticated GitHub client"""
@@ -48,19 +89,8 @@ class GitHubAPIClient:
         return self._github
     
     def _get_http_client(self) -> httpx.AsyncClient:
-        """Get HTTP client for direct API calls"""
-        if self._http_client is None:
-            headers = {}
-            if self.token:
-                headers["Authorization"] = f"token {self.token}"
-            headers["Accept"] = "application/vnd.github.v3+json"
-            
-            self._http_client = httpx.AsyncClient(
-                headers=headers,
-                timeout=30.0,
-                follow_redirects=True
-            )
-        return self._http_client
+        """Get the shared HTTP client for direct API calls"""
+        return get_shared_github_http_client()
     
     def parse_pr_url(self, url: str) -> Tuple[str, int]:
         """
@@ -75,15 +105,8 @@ class GitHubAPIClient:
         Raises:
             GitHubAPIError: If URL format is invalid
         """
-        # Support various GitHub URL formats
-        patterns = [
-            r"github\.com/([^/]+/[^/]+)/pull/(\d+)",
-            r"github\.com/([^/]+/[^/]+)/pulls/(\d+)",
-            r"api\.github\.com/repos/([^/]+/[^/]+)/pulls/(\d+)"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
+        for pattern in _PR_URL_PATTERNS:
+            match = pattern.search(url)
             if match:
                 repository = match.group(1)
                 pr_number = int(match.group(2))
@@ -175,7 +198,7 @@ class GitHubAPIClient:
         
         try:
             # Request diff format
-            headers = {"Accept": "application/vnd.github.v3.diff"}
+            headers = {**self._auth_headers, "Accept": "application/vnd.github.v3.diff"}
             
             response = await client.get(url, headers=headers)
             response.raise_for_status()
@@ -197,7 +220,7 @@ class GitHubAPIClient:
         url = f"https://api.github.com/repos/{repo}/pulls/{pr_number}/files"
         
         try:
-            response = await client.get(url)
+            response = await client.get(url, headers=self._auth_headers)
             response.raise_for_status()
             
             files_data = response.json()
@@ -256,16 +279,10 @@ class GitHubAPIClient:
         
         try:
             client = self._get_http_client()
-            response = await client.get("https://api.github.com/user")
+            response = await client.get("https://api.github.com/user", headers=self._auth_headers)
             return response.status_code == 200
         except:
             return False
-    
-    async def close(self):
-        """Close HTTP client connections"""
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
 
 
 # Retry decorator for API calls
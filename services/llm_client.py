@@ -2,11 +2,19 @@
 LLM Client wrapper for NVIDIA NIM integration
 """
 import asyncio
+import json
 import logging
-from typing import Optional, Dict, Any, Union, List
+import random
+import weakref
+from typing import Optional, Dict, Any, Union, List, AsyncIterator
 from enum import Enum
 import httpx
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup; fall back to the stdlib
+    orjson = None
+
 from langchain_core.language_models import BaseLanguageModel
 from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
 
@@ -15,6 +23,13 @@ from config import settings
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON response body or event, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class LLMProvider(str, Enum):
     """Supported LLM providers"""
     NVIDIA = "nvidia"
@@ -22,7 +37,59 @@ class LLMProvider(str, Enum):
 
 class LLMClientError(Exception):
     """Custom exception for LLM client errors"""
-    pass
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after  # Seconds the server asked us to wait, if any
+
+
+def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Get the Retry-After delay in seconds from a rate-limited response"""
+    if response.status_code not in (429, 503):
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+# One keep-alive connection pool shared by every NimLlmClient, so agents
+# created per review reuse warm connections instead of re-handshaking. Its
+# connections belong to the event loop that opened them, so each loop gets
+# its own pool.
+_shared_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Get or create the running event loop's HTTP client shared by all NIM clients"""
+    loop = asyncio.get_running_loop()
+    client = _shared_http_clients.get(loop)
+    
+    if client is None or client.is_closed:
+        client = _shared_http_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=60.0
+        )
+    
+    return client
+
+
+async def close_shared_http_client():
+    """Close the running event loop's shared HTTP client"""
+    client = _shared_http_clients.pop(asyncio.get_running_loop(), None)
+    
+    if client is not None:
+        await client.aclose()
+
+
+class _NimResponse:
+    """Minimal message-like object with a content attribute for compatibility"""
+    
+    def __init__(self, content: str, usage_metadata: Optional[Dict[str, Any]] = None):
+        self.content = content
+        self.usage_metadata = usage_metadata or {}
 
 
 class NimLlmClient:
@@ -69,56 +136,82 @@ class NimLlmClient:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.endpoint = "https://integrate.api.nvidia.com/v1/chat/completions"
-        self._http_client = None
+        # Sent per request since the connection pool is shared across API keys
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
         
         logger.info(f"NimLlmClient initialized with model: {self.model}")
     
     def _get_http_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client"""
-        if self._http_client is None:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            self._http_client = httpx.AsyncClient(
-                headers=headers,
-                timeout=60.0
-            )
-        return self._http_client
+        """Get the shared HTTP client"""
+        return get_shared_http_client()
     
     def _messages_to_prompt(self, messages: List[BaseMessage]) -> List[Dict[str, str]]:
         """Convert LangChain messages to NVIDIA NIM format"""
         formatted_messages = []
         for msg in messages:
+            content = self._flatten_content(msg.content)
             if isinstance(msg, SystemMessage):
-                formatted_messages.append({"role": "system", "content": msg.content})
+                formatted_messages.append({"role": "system", "content": content})
             elif isinstance(msg, HumanMessage):
-                formatted_messages.append({"role": "user", "content": msg.content})
+                formatted_messages.append({"role": "user", "content": content})
             else:
                 # Default to user role for other message types
-                formatted_messages.append({"role": "user", "content": str(msg.content)})
+                formatted_messages.append({"role": "user", "content": content})
         return formatted_messages
     
-    async def ainvoke(self, messages: List[BaseMessage], **kwargs) -> Any:
-        """Async invoke the NVIDIA NIM API"""
-        client = self._get_http_client()
+    def _flatten_content(self, content: Union[str, List[Any]]) -> str:
+        """
+        Flatten structured content blocks into plain text
         
-        # Convert messages to NVIDIA format
-        formatted_messages = self._messages_to_prompt(messages)
+        NIM caches prompt prefixes automatically, so Anthropic-style
+        cache_control markers are dropped and only the text is kept.
+        """
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            return "".join(
+                block.get("text", "") if isinstance(block, dict) else str(block)
+                for block in content
+            )
+        return str(content)
+    
+    def _parse_usage(self, usage: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Convert OpenAI-style usage into LangChain usage_metadata shape"""
+        if not usage:
+            return {}
         
-        # Prepare request payload
-        payload = {
+        prompt_details = usage.get("prompt_tokens_details") or {}
+        return {
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+            "input_token_details": {
+                "cache_read": prompt_details.get("cached_tokens", 0)
+            }
+        }
+    
+    def _build_payload(self, messages: List[BaseMessage], **kwargs) -> Dict[str, Any]:
+        """Build the chat completion request payload"""
+        return {
             "model": self.model,
-            "messages": formatted_messages,
+            "messages": self._messages_to_prompt(messages),
             "temperature": kwargs.get("temperature", self.temperature),
             "max_tokens": kwargs.get("max_tokens", self.max_tokens),
         }
+    
+    async def ainvoke(self, messages: List[BaseMessage], **kwargs) -> Any:
+        """Async invoke the NVIDIA NIM API"""
+        client = self._get_http_client()
+        payload = self._build_payload(messages, **kwargs)
         
         try:
-            response = await client.post(self.endpoint, json=payload)
+            response = await client.post(self.endpoint, json=payload, headers=self._headers)
             response.raise_for_status()
             
-            result = response.json()
+            result = _json_loads(response.content)
             message = result["choices"][0]["message"]
             
             # Handle thinking models that use reasoning_content
@@ -127,31 +220,81 @@ class NimLlmClient:
                 # For thinking models, use reasoning_content
                 content = message.get("reasoning_content", "")
             
-            # Return a simple object with content attribute for compatibility
-            class Response:
-                def __init__(self, content):
-                    self.content = content
-            
-            return Response(content)
+            return _NimResponse(content, self._parse_usage(result.get("usage")))
             
         except httpx.HTTPStatusError as e:
             error_msg = f"NVIDIA NIM API error: {e.response.status_code} - {e.response.text}"
             logger.error(error_msg)
-            raise LLMClientError(error_msg)
+            raise LLMClientError(error_msg, retry_after=_parse_retry_after(e.response))
         except Exception as e:
             error_msg = f"NVIDIA NIM request failed: {str(e)}"
             logger.error(error_msg)
             raise LLMClientError(error_msg)
     
+    async def astream(self, messages: List[BaseMessage], **kwargs) -> AsyncIterator[Any]:
+        """
+        Async stream the NVIDIA NIM API response
+        
+        Yields content deltas as they arrive over server-sent events.
+        Closing the generator early closes the connection, so the
+        server stops generating tokens nobody will read. Thinking models'
+        reasoning is yielded only if no answer content arrives, matching
+        ainvoke.
+        """
+        client = self._get_http_client()
+        payload = {**self._build_payload(messages, **kwargs), "stream": True}
+        reasoning = []
+        has_content = False
+        
+        try:
+            async with client.stream("POST", self.endpoint, json=payload, headers=self._headers) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+                
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    event = _json_loads(data)
+                    choices = event.get("choices") or [{}]
+                    delta = choices[0].get("delta") or {}
+                    
+                    # Hold back thinking models' reasoning_content in case no
+                    # answer follows
+                    content = delta.get("content")
+                    if content:
+                        has_content = True
+                    elif delta.get("reasoning_content"):
+                        reasoning.append(delta["reasoning_content"])
+                    
+                    yield _NimResponse(content or "", self._parse_usage(event.get("usage")))
+                
+                if not has_content and reasoning:
+                    yield _NimResponse("".join(reasoning), {})
+                    
+        except httpx.HTTPStatusError as e:
+            error_msg = f"NVIDIA NIM API error: {e.response.status_code} - {e.response.text}"
+            logger.error(error_msg)
+            raise LLMClientError(error_msg, retry_after=_parse_retry_after(e.response))
+        except (httpx.HTTPError, ValueError) as e:
+            error_msg = f"NVIDIA NIM stream failed: {str(e)}"
+            logger.error(error_msg)
+            raise LLMClientError(error_msg)
+    
     def invoke(self, messages: List[BaseMessage], **kwargs) -> Any:
-        """Sync invoke (runs async version)"""
-        return asyncio.run(self.ainvoke(messages, **kwargs))
+        """Sync invoke (runs async version on its own event loop)"""
+        return asyncio.run(self._invoke_and_close(messages, **kwargs))
     
-    async def aclose(self):
-        """Close HTTP client"""
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+    async def _invoke_and_close(self, messages: List[BaseMessage], **kwargs) -> Any:
+        """Invoke, then close the pool opened for this call's short-lived event loop"""
+        try:
+            return await self.ainvoke(messages, **kwargs)
+        finally:
+            await close_shared_http_client()
 
 
 class LLMClient:
@@ -295,8 +438,6 @@ class LLMClient:
             True if connection successful, False otherwise
         """
         try:
-            from langchain.schema import HumanMessage
-            
             test_messages = [
                 HumanMessage(content="Hello, please respond with 'OK' if you can hear me.")
             ]
@@ -383,16 +524,21 @@ async def with_retry(
     operation,
     max_retries: int = 3,
     delay: float = 1.0,
-    backoff_factor: float = 2.0
+    backoff_factor: float = 2.0,
+    max_delay: float = 30.0
 ):
     """
-    Execute operation with exponential backoff retry
+    Execute operation with jittered exponential backoff retry
+    
+    Each delay is scaled by a random factor in [0.5, 1.5) so callers that
+    fail together, e.g. on a rate limit, don't retry in lockstep.
     
     Args:
         operation: Async operation to execute
         max_retries: Maximum number of retries
         delay: Initial delay between retries
         backoff_factor: Multiplier for delay on each retry
+        max_delay: Upper bound on the delay before jitter
         
     Returns:
         Operation result
@@ -401,7 +547,6 @@ async def with_retry(
         Exception: If all retries fail
     """
     last_exception = None
-    current_delay = delay
     
     for attempt in range(max_retries + 1):
         try:
@@ -410,12 +555,12 @@ async def with_retry(
             last_exception = e
             
             if attempt < max_retries:
+                current_delay = min(max_delay, delay * backoff_factor ** attempt) * (0.5 + random.random())
                 logger.warning(
                     f"Operation failed (attempt {attempt + 1}/{max_retries + 1}), "
-                    f"retrying in {current_delay}s: {e}"
+                    f"retrying in {current_delay:.2f}s: {e}"
                 )
                 await asyncio.sleep(current_delay)
-                current_delay *= backoff_factor
             else:
                 logger.error(f"Operation failed after {max_retries + 1} attempts: {e}")
     
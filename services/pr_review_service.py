@@ -50,7 +50,8 @@ class PRReviewService:
     async def review_pr_from_url(
         self,
         pr_url: str,
-        config: Optional[ReviewConfig] = None
+        config: Optional[ReviewConfig] = None,
+        review_id: Optional[str] = None
     ) -> ReviewResponse:
         """
         Review a PR from GitHub URL
@@ -58,6 +59,7 @@ class PRReviewService:
         Args:
             pr_url: GitHub PR URL
             config: Review configuration
+            review_id: ID to persist the review under (optional)
             
         Returns:
             ReviewResponse with findings and formatted comments
@@ -99,7 +101,8 @@ class PRReviewService:
             response = await self._perform_review(
                 parsed_diff=parsed_diff,
                 pr_metadata=pr_metadata,
-                config=config
+                config=config,
+                review_id=review_id
             )
             
             execution_time = (datetime.utcnow() - start_time).total_seconds()
@@ -122,7 +125,8 @@ class PRReviewService:
         diff_content: str,
         repository: Optional[str] = None,
         pr_number: Optional[int] = None,
-        config: Optional[ReviewConfig] = None
+        config: Optional[ReviewConfig] = None,
+        review_id: Optional[str] = None
     ) -> ReviewResponse:
         """
         Review code from manual diff input
@@ -132,6 +136,7 @@ class PRReviewService:
             repository: Optional repository name
             pr_number: Optional PR number
             config: Review configuration
+            review_id: ID to persist the review under (optional)
             
         Returns:
             ReviewResponse with findings and formatted comments
@@ -158,7 +163,8 @@ class PRReviewService:
             response = await self._perform_review(
                 parsed_diff=parsed_diff,
                 pr_metadata=pr_metadata,
-                config=config
+                config=config,
+                review_id=review_id
             )
             
             execution_time = (datetime.utcnow() - start_time).total_seconds()
@@ -177,7 +183,8 @@ class PRReviewService:
         self,
         parsed_diff: ParsedDiff,
         pr_metadata: Optional[PRMetadata] = None,
-        config: Optional[ReviewConfig] = None
+        config: Optional[ReviewConfig] = None,
+        review_id: Optional[str] = None
     ) -> ReviewResponse:
         """
         Perform the actual review workflow
@@ -186,6 +193,7 @@ class PRReviewService:
             parsed_diff: Parsed diff with file changes
             pr_metadata: Optional PR metadata
             config: Review configuration
+            review_id: ID to persist the review under (optional)
             
         Returns:
             ReviewResponse with findings and formatted comments
@@ -208,26 +216,27 @@ class PRReviewService:
         formatted_review = self.comment_generator.generate_comments(findings)
         
         # Persist review if database session available
-        review_id = None
+        stored_review_id = None
         if self.db_session and pr_metadata:
             try:
                 logger.info("Persisting review to database")
                 repository = ReviewRepository(self.db_session)
-                review_id = await repository.save_review(
+                stored_review_id = await repository.save_review(
                     pr_metadata=pr_metadata,
                     commit_sha=pr_metadata.commit_sha or "",
                     findings=findings,
                     config=config,
-                    summary=formatted_review.summary
+                    summary=formatted_review.summary,
+                    review_id=review_id
                 )
-                logger.info(f"Review persisted with ID: {review_id}")
+                logger.info(f"Review persisted with ID: {stored_review_id}")
             except Exception as e:
                 logger.error(f"Failed to persist review: {e}", exc_info=True)
                 # Continue even if persistence fails
         
         # Create response
         response = ReviewResponse(
-            review_id=review_id or "",
+            review_id=stored_review_id or "",
             pr_metadata=pr_metadata,
             findings=findings,
             summary=formatted_review.summary,
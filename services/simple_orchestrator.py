@@ -45,7 +45,11 @@ class SimpleOrchestrator:
         """
         self.llm = llm
         self.config = config or ReviewConfig()
-        self.agent_config = AgentConfig()
+        # Agents split files into batches and analyze them concurrently; this
+        # caps the LLM requests in flight across all of them
+        self.agent_config = AgentConfig(
+            max_inflight=settings.llm_max_concurrency
+        )
         
         # Initialize analyzer agents
         self.agents = self._initialize_agents()
@@ -138,20 +142,16 @@ class SimpleOrchestrator:
             
             logger.info(f"Starting review with {len(self.agents)} agents")
             
-            # Run all agents concurrently
-            tasks = []
-            for agent_name, agent in self.agents.items():
-                task = self._run_agent(agent_name, agent, context)
-                tasks.append(task)
-            
-            # Wait for all agents to complete
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Run all agents concurrently - they share no mutable state, so
+            # review latency is the slowest agent rather than the sum
+            results = await asyncio.gather(
+                *(self._run_agent(agent_name, agent, context) for agent_name, agent in self.agents.items()),
+                return_exceptions=True
+            )
             
             # Aggregate findings
             all_findings = []
-            for i, result in enumerate(results):
-                agent_name = list(self.agents.keys())[i]
-                
+            for agent_name, result in zip(self.agents, results):
                 if isinstance(result, Exception):
                     logger.error(f"Agent {agent_name} failed: {result}")
                     continue